@@ -22,15 +22,32 @@ from core.concurrent_docgen import (
     process_archive,
     generate_all_documentation_concurrent,
     generate_all_documentation_batch,
+    generate_all_documentation_async,
+    generate_all_documentation_message_batch,
 )
 from utils.documentation import organize_documentation_by_dir
-from utils.debug import show_debug_info
+from config.constants import DEFAULT_FULL_CONCURRENCY_THREADS
+from utils.debug import debug_panel, is_debug_enabled
 
 
-load_dotenv(dotenv_path=".env", verbose=True)
+@st.cache_resource(show_spinner=False)
+def _load_env():
+    """
+    Load .env once per process instead of on every rerun.
+
+    This is the only place .env is loaded, and it runs before anything reads
+    the environment. A .env next to this file is loaded first, so it wins
+    over one in the working directory, as it did before.
+    """
+    load_dotenv()
+    load_dotenv(dotenv_path=".env")
+    return True
+
 
 def main():
     """Main application function with history integration."""
+    _load_env()
+
     # Setup page
     setup_page()
     demo_pw = os.getenv("DEMO_PW")
@@ -90,11 +107,28 @@ def main():
                             files, config, config.get("batch_size", 3)
                         )
                     elif config.get("concurrency_method") == "Full Concurrent":
+                        max_workers = config.get(
+                            "max_workers", DEFAULT_FULL_CONCURRENCY_THREADS
+                        )
                         st.info(
-                            f"Using concurrent processing with {config.get('max_workers', 3)} workers"
+                            f"Using concurrent processing with {max_workers} workers"
                         )
                         documentation = generate_all_documentation_concurrent(
-                            files, config, config.get("max_workers", 3)
+                            files, config, max_workers
+                        )
+                    elif config.get("concurrency_method") == "Async Concurrent":
+                        st.info(
+                            f"Using async processing with up to {config.get('max_concurrent')} concurrent requests"
+                        )
+                        documentation = generate_all_documentation_async(
+                            files, config, config.get("max_concurrent")
+                        )
+                    elif config.get("concurrency_method") == "Message Batch API":
+                        st.info(
+                            "Using the Message Batches API; this can take several minutes"
+                        )
+                        documentation = generate_all_documentation_message_batch(
+                            files, config
                         )
                     else:
                         from core.docgen import generate_all_documentation
@@ -127,8 +161,8 @@ def main():
 
     with tab2:
         display_documentation_history()
-    if os.getenv("DEBUG") == "true":
-        show_debug_info()
+    if is_debug_enabled():
+        debug_panel()
 
 
 if __name__ == "__main__":
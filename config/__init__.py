@@ -6,14 +6,23 @@ This makes the configuration settings importable from the config package.
 from config.constants import (
     SUPPORTED_EXTENSIONS,
     SUPPORTED_ARCHIVE_FORMATS,
+    FILE_TYPE_CATEGORIES,
+    LANGUAGE_CATEGORIES,
+    SUPPORTED_EXTENSIONS_SET,
+    SUPPORTED_ARCHIVE_FORMATS_SET,
+    SUPPORTED_EXT_RE,
+    TAR_STREAM_MODES,
+    get_archive_extension,
     DEFAULT_MODEL,
     DEFAULT_TEMPERATURE,
     DOC_LEVELS,
     DEFAULT_DOC_LEVEL,
+    DOC_LEVEL_MAX_TOKENS,
     DEFAULT_MAX_FILE_SIZE_MB,
     MAX_FILE_SIZE_RANGE,
     APP_CSS,
     MERMAID_SCRIPT,
+    MERMAID_MD_TEMPLATE,
     MAX_FILE_SIZE_RANGE,
     MAX_FILE_SIZE_DEMO_MODE,
     MIN_BATCH_SIZE,
@@ -21,4 +30,10 @@ from config.constants import (
     MAX_BATCH_SIZE_DEMO_MODE,
     MIN_FULL_CONCURRENCY_THREADS,
     MAX_FULL_CONCURRENCY_THREADS,
+    DEFAULT_FULL_CONCURRENCY_THREADS,
+    MIN_ASYNC_CONCURRENCY,
+    MAX_ASYNC_CONCURRENCY,
+    DEFAULT_ASYNC_CONCURRENCY,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    REQUESTS_PER_MINUTE_RANGE,
 )
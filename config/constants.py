@@ -2,6 +2,10 @@
 Application constants and configuration settings.
 """
 
+import re
+import sys
+from types import MappingProxyType
+
 SUPPORTED_EXTENSIONS = {
     # Core programming languages
     ".py": "Python",
@@ -68,83 +72,100 @@ SUPPORTED_EXTENSIONS = {
     ".hpp": "C++ Header",
     ".pyi": "Python Interface",
 }
+# Interned so every extracted file shares one string object per language
+SUPPORTED_EXTENSIONS = {
+    ext: sys.intern(language) for ext, language in SUPPORTED_EXTENSIONS.items()
+}
+
+# Sidebar categories; languages are looked up in SUPPORTED_EXTENSIONS
+_CATEGORY_EXTENSIONS = {
+    "Programming Languages": (
+        ".py", ".js", ".ts", ".java", ".cpp", ".c", ".cs", ".go", ".rb", ".php",
+        ".swift", ".rs", ".kt", ".dart", ".scala",
+    ),
+    "Web & Frontend": (
+        ".html", ".css", ".scss", ".sass", ".jsx", ".tsx", ".vue", ".xml",
+    ),
+    "Database & Queries": (
+        ".sql", ".psql", ".plsql",
+    ),
+    "Scripts & Shell": (
+        ".sh", ".bash", ".ps1", ".bat", ".lua", ".pl",
+    ),
+    "Configuration & Data": (
+        ".yaml", ".yml", ".json", ".toml", ".ini", ".env", ".properties",
+    ),
+    "Documentation": (
+        ".md", ".rst", ".tex",
+    ),
+    "Other": (
+        ".dockerfile", ".makefile", ".gradle", ".r", ".R", ".jl", ".m", ".h", ".hpp",
+        ".pyi", ".hs", ".clj",
+    ),
+}
 
 FILE_TYPE_CATEGORIES = {
-    "Programming Languages": [
-        (".py", "Python"),
-        (".js", "JavaScript"),
-        (".ts", "TypeScript"),
-        (".java", "Java"),
-        (".cpp", "C++"),
-        (".c", "C"),
-        (".cs", "C#"),
-        (".go", "Go"),
-        (".rb", "Ruby"),
-        (".php", "PHP"),
-        (".swift", "Swift"),
-        (".rs", "Rust"),
-        (".kt", "Kotlin"),
-        (".dart", "Dart"),
-        (".scala", "Scala"),
-    ],
-    "Web & Frontend": [
-        (".html", "HTML"),
-        (".css", "CSS"),
-        (".scss", "SCSS"),
-        (".sass", "Sass"),
-        (".jsx", "React JSX"),
-        (".tsx", "React TSX"),
-        (".vue", "Vue.js"),
-        (".xml", "XML"),
-    ],
-    "Database & Queries": [
-        (".sql", "SQL"),
-        (".psql", "PostgreSQL"),
-        (".plsql", "PL/SQL"),
-    ],
-    "Scripts & Shell": [
-        (".sh", "Shell"),
-        (".bash", "Bash"),
-        (".ps1", "PowerShell"),
-        (".bat", "Batch"),
-        (".lua", "Lua"),
-        (".pl", "Perl"),
-    ],
-    "Configuration & Data": [
-        (".yaml", "YAML"),
-        (".yml", "YAML"),
-        (".json", "JSON"),
-        (".toml", "TOML"),
-        (".ini", "INI Config"),
-        (".env", "Environment"),
-        (".properties", "Properties"),
-    ],
-    "Documentation": [
-        (".md", "Markdown"),
-        (".rst", "reStructuredText"),
-        (".tex", "LaTeX"),
-    ],
-    "Other": [
-        (".dockerfile", "Dockerfile"),
-        (".makefile", "Makefile"),
-        (".gradle", "Gradle"),
-        (".r", "R"),
-        (".R", "R"),
-        (".jl", "Julia"),
-        (".m", "MATLAB"),
-        (".h", "C/C++ Header"),
-        (".hpp", "C++ Header"),
-        (".pyi", "Python Interface"),
-        (".hs", "Haskell"),
-        (".clj", "Clojure"),
-    ],
+    category: [(ext, SUPPORTED_EXTENSIONS[ext]) for ext in extensions]
+    for category, extensions in _CATEGORY_EXTENSIONS.items()
+}
+
+# Reverse lookup used to tally extracted files by category
+LANGUAGE_CATEGORIES = {
+    SUPPORTED_EXTENSIONS[ext]: category
+    for category, extensions in _CATEGORY_EXTENSIONS.items()
+    for ext in extensions
 }
 
 # Supported archive formats
 SUPPORTED_ARCHIVE_FORMATS = {
     ".zip": "ZIP",
     ".7z": "7-Zip",
+    ".tar": "TAR",
+    ".tar.gz": "TAR (gzip)",
+    ".tgz": "TAR (gzip)",
+    ".tar.bz2": "TAR (bzip2)",
+    ".tar.xz": "TAR (xz)",
 }
+
+# tarfile stream modes; "r|" reads members sequentially without seeking
+TAR_STREAM_MODES = {
+    ".tar": "r|",
+    ".tar.gz": "r|gz",
+    ".tgz": "r|gz",
+    ".tar.bz2": "r|bz2",
+    ".tar.xz": "r|xz",
+}
+TAR_STREAM_BUFSIZE = 2 * 1024 * 1024
+
+# Precomputed lookups so archive entries can be filtered with a single check
+SUPPORTED_EXTENSIONS_SET = frozenset(SUPPORTED_EXTENSIONS)
+SUPPORTED_ARCHIVE_FORMATS_SET = frozenset(SUPPORTED_ARCHIVE_FORMATS)
+SUPPORTED_EXT_RE = re.compile(
+    r"(?i)\.(" + "|".join(re.escape(ext[1:]) for ext in SUPPORTED_EXTENSIONS) + r")$"
+)
+
+
+def get_archive_extension(file_name: str) -> str:
+    """
+    Return the archive extension of a file name, including compound ones.
+
+    Looks up the last two suffixes, then the last one, so the cost does not
+    grow with the number of supported formats.
+
+    Args:
+        file_name: Name of the archive file
+
+    Returns:
+        Lowercased extension such as ".zip" or ".tar.gz", or "" if none
+    """
+    parts = file_name.lower().rsplit(".", 2)
+    if len(parts) == 3:
+        compound = f".{parts[1]}.{parts[2]}"
+        if compound in SUPPORTED_ARCHIVE_FORMATS_SET:
+            return compound
+    return f".{parts[-1]}" if len(parts) > 1 else ""
+
+
 # ZipBomb protections
 MAX_EXTRACT_SIZE = 300 * 1024 * 1024  
 MAX_FILES = 1000  
@@ -157,10 +178,32 @@ BASIC_LEVEL_MAX_TOKENS=4000
 COMPREHENSIVE_LEVEL_MAX_TOKENS=5000
 EXPERT_LEVEL_MAX_TOKENS=7000
 PROJECT_OVERVIEW_MAX_TOKENS=5000
+# Bump when the documentation prompt changes to invalidate cached results
+DOC_PROMPT_VERSION = "1"
+
+# Per-file documentation kept on disk across runs and restarts
+DOC_CACHE_PATH = ".streamlit/cache/documentation.sqlite3"
+DOC_CACHE_MAX_ENTRIES = 2000
+
+# Markdown stored under "__mermaid_diagram__"; filled with the Mermaid code
+MERMAID_MD_TEMPLATE = """
+# Project Directory Structure Mermaid Code
+
+```mermaid
+%s
+```
+"""
 
 # Documentation detail levels
 DOC_LEVELS = ["basic", "comprehensive", "expert"]
 DEFAULT_DOC_LEVEL = "comprehensive"
+DOC_LEVEL_MAX_TOKENS = MappingProxyType(
+    {
+        "basic": BASIC_LEVEL_MAX_TOKENS,
+        "comprehensive": COMPREHENSIVE_LEVEL_MAX_TOKENS,
+        "expert": EXPERT_LEVEL_MAX_TOKENS,
+    }
+)
 
 # File size limits
 DEFAULT_MAX_FILE_SIZE_MB = 5
@@ -172,7 +215,40 @@ MIN_BATCH_SIZE = 2
 MAX_BATCH_SIZE = 5
 MAX_BATCH_SIZE_DEMO_MODE = 3
 MIN_FULL_CONCURRENCY_THREADS = 2
-MAX_FULL_CONCURRENCY_THREADS = 8
+MAX_FULL_CONCURRENCY_THREADS = 16
+DEFAULT_FULL_CONCURRENCY_THREADS = 8
+# Threads in the process-wide documentation pool, shared by all sessions
+DOC_EXECUTOR_MAX_WORKERS = 32
+MIN_ASYNC_CONCURRENCY = 2
+MAX_ASYNC_CONCURRENCY = 64
+DEFAULT_ASYNC_CONCURRENCY = 32
+# Batch Processing groups small files into one Claude request
+MULTI_FILE_MAX_FILES = 4
+MULTI_FILE_MAX_CHARS = 12000
+# Kept under the SDK's non-streaming limit
+MULTI_FILE_MAX_TOKENS = 16000
+
+# Threads for the per-file and per-directory overview summaries
+OVERVIEW_SUMMARY_WORKERS = 8
+
+# HTTP connection pool for the Claude clients; keep-alive covers the async
+# maximum so connections are reused rather than reopened
+HTTP_MAX_CONNECTIONS = 100
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 64
+HTTP_KEEPALIVE_EXPIRY = 60
+
+# Client-side Claude API rate limiting
+DEFAULT_REQUESTS_PER_MINUTE = 50
+REQUESTS_PER_MINUTE_RANGE = (10, 1000)
+RATE_LIMIT_BURST = 5
+
+# Minimum seconds between progress redraws (about 20 per second)
+PROGRESS_MIN_INTERVAL = 0.05
+
+# Message Batches API polling
+MESSAGE_BATCH_POLL_INTERVAL = 2
+# Seconds to wait for a batch before cancelling it
+MESSAGE_BATCH_MAX_WAIT = 60 * 60
 
 # Custom CSS for the application
 APP_CSS = """
@@ -3,4 +3,4 @@ Core functionality package initialization.
 """
 
 from core.docgen import generate_all_documentation
-from core.concurrent_docgen import process_archive, generate_all_documentation_batch, generate_all_documentation_concurrent
\ No newline at end of file
+from core.concurrent_docgen import process_archive, generate_all_documentation_batch, generate_all_documentation_concurrent, generate_all_documentation_async, generate_all_documentation_message_batch
\ No newline at end of file
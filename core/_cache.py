@@ -0,0 +1,326 @@
+"""
+Streamlit cache wrappers for expensive, rerun-invariant work, and the
+on-disk store for per-file documentation.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import streamlit as st
+
+from config.constants import (
+    DEFAULT_MODEL,
+    DEFAULT_TEMPERATURE,
+    DOC_CACHE_MAX_ENTRIES,
+    DOC_CACHE_PATH,
+    DOC_PROMPT_VERSION,
+)
+from utils.api import generate_content_based_overview, generate_documentation
+from utils.archive import content_digest, extract_files_from_archive
+from utils.documentation import retitle_documentation
+
+
+def archive_digest(archive_data: bytes) -> str:
+    """
+    Hash the uploaded archive bytes so cache lookups key on content, not object id.
+
+    Args:
+        archive_data: Raw bytes of the uploaded archive
+
+    Returns:
+        Hex digest of the archive contents
+    """
+    return hashlib.blake2b(archive_data, digest_size=16).hexdigest()
+
+
+@st.cache_data(show_spinner=False, max_entries=8, ttl=3600)
+def cached_extract_files(
+    content_hash: str,
+    file_name: str,
+    selected_extensions: Tuple[str, ...],
+    max_file_size: int,
+    _archive_data: bytes,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Extract files from an archive, reusing the result across Streamlit reruns.
+
+    The leading underscore keeps Streamlit from hashing the archive bytes;
+    ``content_hash`` and ``file_name`` identify it instead.
+
+    Args:
+        content_hash: Digest of the archive bytes (see archive_digest)
+        file_name: Name of the uploaded archive, used to pick the format
+        selected_extensions: Sorted tuple of file extensions to extract
+        max_file_size: Maximum size of individual files to process in MB
+        _archive_data: Raw bytes of the archive, only read on a cache miss
+
+    Returns:
+        Dictionary mapping file paths to their content
+    """
+    return extract_files_from_archive(
+        _archive_data, file_name, selected_extensions, max_file_size
+    )
+
+
+class DocumentationStore:
+    """
+    Per-file documentation persisted to disk, keyed on _documentation_key.
+
+    This is the one place per-file documentation is read from and written
+    to, whichever mode generated it. Only successful documentation should be
+    stored. Beyond max_entries, the entries written longest ago are dropped.
+    """
+
+    def __init__(self, path: str, max_entries: int):
+        """
+        Args:
+            path: SQLite database file, created on first use
+            max_entries: Number of entries to keep
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._max_entries = max_entries
+        self._lock = threading.Lock()
+        # Worker threads share the connection; the lock serialises its use
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS documentation ("
+                "key TEXT PRIMARY KEY, file_path TEXT, text TEXT, written REAL)"
+            )
+
+    @staticmethod
+    def _row_key(key: Tuple) -> str:
+        return hashlib.blake2b(repr(key).encode("utf-8"), digest_size=16).hexdigest()
+
+    def get(self, key: Tuple, file_path: str) -> Optional[str]:
+        """
+        Return the stored documentation for key titled for file_path.
+
+        The key holds no path, so documentation stored for a file that was
+        since renamed or moved is found too; only its title is rewritten.
+        Returns None on a miss.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT file_path, text FROM documentation WHERE key = ?",
+                (self._row_key(key),),
+            ).fetchone()
+        if row is None:
+            return None
+        return retitle_documentation(row[1], row[0], file_path)
+
+    def put(self, key: Tuple, file_path: str, documentation: str):
+        """Store documentation for key, generated for file_path."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO documentation VALUES (?, ?, ?, ?)",
+                (self._row_key(key), file_path, documentation, time.time()),
+            )
+            self._conn.execute(
+                "DELETE FROM documentation WHERE key NOT IN ("
+                "SELECT key FROM documentation ORDER BY written DESC LIMIT ?)",
+                (self._max_entries,),
+            )
+
+
+@st.cache_resource(show_spinner=False)
+def _get_documentation_store() -> DocumentationStore:
+    """Open the per-file documentation store once per process."""
+    return DocumentationStore(DOC_CACHE_PATH, DOC_CACHE_MAX_ENTRIES)
+
+
+def _documentation_key(
+    file_info: Dict[str, Any], doc_level: str
+) -> Tuple[str, str, str, float, str, str]:
+    """
+    Build the DocumentationStore key for one file's documentation.
+
+    Like dedupe_files_by_digest, the key is the content and language and not
+    the path, so identical content is reused wherever it lives.
+    """
+    return (
+        file_info.get("digest")
+        or content_digest(file_info["content"].encode("utf-8")),
+        file_info["language"],
+        DEFAULT_MODEL,
+        DEFAULT_TEMPERATURE,
+        doc_level,
+        DOC_PROMPT_VERSION,
+    )
+
+
+def generate_documentation_cached(
+    file_path: str,
+    file_info: Dict[str, Any],
+    client,
+    doc_level: str = "comprehensive",
+    raise_errors: bool = False,
+) -> str:
+    """
+    Cached drop-in for utils.api.generate_documentation.
+
+    Documentation is read from and stored in the DocumentationStore; API
+    errors are never stored.
+
+    Args:
+        file_path: Path of the file within the archive
+        file_info: Dict containing file content and language
+        client: Anthropic client instance
+        doc_level: Level of detail for documentation
+        raise_errors: Re-raise API errors instead of returning an error message
+
+    Returns:
+        Generated documentation text, or an error message if generation failed
+    """
+    store = _get_documentation_store()
+    key = _documentation_key(file_info, doc_level)
+    documentation = store.get(key, file_path)
+    if documentation is not None:
+        return documentation
+    try:
+        documentation = generate_documentation(
+            file_path, file_info, client, doc_level, raise_errors=True
+        )
+    except Exception as e:
+        if raise_errors:
+            raise
+        return f"Error generating documentation: {str(e)}"
+    store.put(key, file_path, documentation)
+    return documentation
+
+
+def lookup_cached_documentation(
+    files: Dict[str, Dict[str, Any]], doc_level: str = "comprehensive"
+) -> Tuple[Dict[str, str], Dict[str, Dict[str, Any]]]:
+    """
+    Split files into those already documented in the cache and the rest.
+
+    Lets modes that do not go through generate_documentation_cached, such as
+    async and message batches, skip files documented by any earlier run.
+
+    Args:
+        files: Dictionary of extracted files
+        doc_level: Level of detail for documentation
+
+    Returns:
+        Tuple of (cached, missing): cached maps file paths to their cached
+        documentation, missing holds the files that still need a request
+    """
+    store = _get_documentation_store()
+    cached = {}
+    missing = {}
+    for file_path, file_info in files.items():
+        documentation = store.get(_documentation_key(file_info, doc_level), file_path)
+        if documentation is None:
+            missing[file_path] = file_info
+        else:
+            cached[file_path] = documentation
+    return cached, missing
+
+
+def store_cached_documentation(
+    file_path: str,
+    file_info: Dict[str, Any],
+    documentation: str,
+    doc_level: str = "comprehensive",
+) -> None:
+    """
+    Store documentation generated outside generate_documentation_cached.
+
+    The entry uses the same key as generate_documentation_cached, so every
+    mode reuses it. Only successful documentation should be stored.
+
+    Args:
+        file_path: Path of the file within the archive
+        file_info: Dict containing file content and language
+        documentation: Generated documentation text
+        doc_level: Level of detail for documentation
+    """
+    _get_documentation_store().put(
+        _documentation_key(file_info, doc_level), file_path, documentation
+    )
+
+
+def documentation_digest(documentation: Dict[str, str]) -> str:
+    """
+    Hash the per-file documentation, ignoring the special "__" entries.
+
+    Args:
+        documentation: Dictionary of generated documentation (file_path -> documentation)
+
+    Returns:
+        Hex digest of the file paths and their documentation
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    for file_path in sorted(documentation):
+        if not file_path.startswith("__"):
+            digest.update(file_path.encode("utf-8") + b"\0")
+            digest.update(documentation[file_path].encode("utf-8") + b"\0")
+    return digest.hexdigest()
+
+
+class _OverviewError(RuntimeError):
+    """Overview error text raised only to keep it out of the cache."""
+
+
+@st.cache_data(show_spinner=False, max_entries=32, ttl=3600)
+def cached_generate_content_based_overview(
+    documentation_hash: str,
+    force_content_overview: bool,
+    model: str,
+    temperature: float,
+    prompt_version: str,
+    _documentation: Dict[str, str],
+    _files: Dict[str, Dict[str, Any]],
+    _client,
+) -> str:
+    """
+    Generate the content-based project overview, reused while the docs are unchanged.
+
+    Overview failures, including failed file or directory summaries, come
+    back as error text, so they are raised here to keep them out of the cache.
+
+    Returns:
+        Generated project overview text
+    """
+    overview = generate_content_based_overview(_documentation, _files, _client)
+    if overview.startswith("Error generating"):
+        raise _OverviewError(overview)
+    return overview
+
+
+def generate_content_based_overview_cached(
+    documentation: Dict[str, str],
+    files: Dict[str, Dict[str, Any]],
+    client,
+) -> str:
+    """
+    Cached drop-in for utils.api.generate_content_based_overview.
+
+    Args:
+        documentation: Dictionary of generated documentation (file_path -> documentation)
+        files: Original file structure info
+        client: Anthropic client instance
+
+    Returns:
+        Generated project overview text, or an error message if generation failed
+    """
+    try:
+        return cached_generate_content_based_overview(
+            documentation_digest(documentation),
+            bool(st.session_state.force_content_overview),
+            DEFAULT_MODEL,
+            DEFAULT_TEMPERATURE,
+            DOC_PROMPT_VERSION,
+            documentation,
+            files,
+            client,
+        )
+    except _OverviewError as e:
+        return str(e)
@@ -3,24 +3,53 @@ Core documentation generation with concurrency support
 """
 
 import time
+import asyncio
 import streamlit as st
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
 import threading
 import queue
+from collections import defaultdict
+from config.constants import (
+    DEFAULT_ASYNC_CONCURRENCY,
+    DEFAULT_FULL_CONCURRENCY_THREADS,
+    DOC_EXECUTOR_MAX_WORKERS,
+    MERMAID_MD_TEMPLATE,
+    MESSAGE_BATCH_MAX_WAIT,
+    MESSAGE_BATCH_POLL_INTERVAL,
+    MULTI_FILE_MAX_CHARS,
+    MULTI_FILE_MAX_FILES,
+    PROGRESS_MIN_INTERVAL,
+)
 from utils.api import (
     initialize_client,
-    generate_documentation,
+    initialize_async_client,
+    is_fatal_api_error,
+    is_rate_limit_error,
+    with_rate_cap,
+    generate_documentation_async,
+    generate_documentation_multi,
+    create_documentation_batch,
+    iter_documentation_batch_results,
     generate_project_overview_simple,
-    generate_content_based_overview,
 )
-from utils.archive import extract_files_from_archive
+from utils.archive import content_digest
+from utils.documentation import retitle_documentation
 from utils.visualization import build_directory_tree
-import os
+from core._cache import (
+    archive_digest,
+    cached_extract_files,
+    generate_content_based_overview_cached,
+    generate_documentation_cached,
+    lookup_cached_documentation,
+    store_cached_documentation,
+)
 
 
 def process_archive(uploaded_file, file_extension, config):
     """
     Extract files from the uploaded archive based on configuration.
+    Results are cached on the archive contents, so reruns skip re-extraction.
 
     Args:
         uploaded_file: The uploaded archive file
@@ -31,8 +60,14 @@ def process_archive(uploaded_file, file_extension, config):
         Dictionary of extracted files or None if error
     """
     try:
-        files = extract_files_from_archive(
-            uploaded_file, config["selected_extensions"], config["max_file_size"]
+        # Read the upload once; hashing and extraction share these bytes
+        archive_data = uploaded_file.getvalue()
+        files = cached_extract_files(
+            archive_digest(archive_data),
+            uploaded_file.name,
+            tuple(sorted(config["selected_extensions"])),
+            config["max_file_size"],
+            archive_data,
         )
         return files
     except Exception as e:
@@ -43,27 +78,238 @@ def process_archive(uploaded_file, file_extension, config):
         return None
 
 
-def generate_file_documentation_worker(args):
+@st.cache_resource(show_spinner=False)
+def _get_executor() -> ThreadPoolExecutor:
+    """
+    Create one documentation thread pool per process.
+
+    Threads are started lazily and kept across batches and reruns. Each
+    generation mode bounds its own in-flight work, so sessions sharing the
+    pool still get the concurrency they asked for.
+    """
+    return ThreadPoolExecutor(
+        max_workers=DOC_EXECUTOR_MAX_WORKERS, thread_name_prefix="claude-doc"
+    )
+
+
+def generate_file_documentation_worker(file_path, file_info, client, doc_level):
     """
     Generate documentation for a single file (worker function for threading).
     This function runs in a background thread without Streamlit context.
 
     Args:
-        args: Tuple of (file_path, file_info, client, doc_level)
+        file_path: Path of the file within the archive
+        file_info: Dict containing file content and language
+        client: Anthropic client instance
+        doc_level: Level of detail for documentation
 
     Returns:
-        Tuple of (file_path, documentation, success)
-    """
-    file_path, file_info, client, doc_level = args
+        Tuple of (file_path, documentation, success, error_message)
 
+    Raises:
+        Exception: If the API error would fail every other file too
+    """
     try:
-        documentation = generate_documentation(file_path, file_info, client, doc_level)
+        # Raise so API failures are reported as failures, not as documentation
+        documentation = generate_documentation_cached(
+            file_path, file_info, client, doc_level, raise_errors=True
+        )
         return file_path, documentation, True, ""
     except Exception as e:
+        if is_fatal_api_error(e):
+            raise
         return file_path, f"Error generating documentation: {str(e)}", False, str(e)
 
 
-def generate_all_documentation_concurrent(files, config, max_workers=3):
+def generate_chunk_documentation_worker(chunk, client, doc_level):
+    """
+    Generate documentation for a chunk of files (worker function for threading).
+
+    A chunk of several small files is documented in one request, and each
+    file's section is cached under its own per-file key. Any file missing
+    from the combined response, or every file if the request fails, is then
+    documented on its own; a rate-limited request fails the whole chunk
+    instead, since more requests would only add to the load.
+
+    Args:
+        chunk: List of (file_path, file_info) tuples
+        client: Anthropic client instance
+        doc_level: Level of detail for documentation
+
+    Returns:
+        List of (file_path, documentation, success, error_message) tuples
+
+    Raises:
+        Exception: If the API error would fail every other file too
+    """
+    docs = {}
+    if len(chunk) > 1:
+        try:
+            docs = generate_documentation_multi(chunk, client, doc_level)
+        except Exception as e:
+            if is_fatal_api_error(e):
+                raise
+            if is_rate_limit_error(e):
+                return [
+                    (
+                        file_path,
+                        f"Error generating documentation: {str(e)}",
+                        False,
+                        str(e),
+                    )
+                    for file_path, _ in chunk
+                ]
+        for file_path, file_info in chunk:
+            if file_path in docs:
+                store_cached_documentation(
+                    file_path, file_info, docs[file_path], doc_level
+                )
+
+    return [
+        (file_path, docs[file_path], True, "")
+        if file_path in docs
+        else generate_file_documentation_worker(
+            file_path, file_info, client, doc_level
+        )
+        for file_path, file_info in chunk
+    ]
+
+
+def chunk_small_files(
+    file_items, max_files=MULTI_FILE_MAX_FILES, max_chars=MULTI_FILE_MAX_CHARS
+):
+    """
+    Group consecutive small files so they can share one Claude request.
+
+    Files of max_chars characters or more end up alone; smaller ones are
+    grouped until a group would exceed max_files files or max_chars characters.
+
+    Args:
+        file_items: Iterable of (file_path, file_info) tuples
+        max_files: Maximum number of files in one group
+        max_chars: Maximum combined content length of one group
+
+    Yields:
+        Lists of (file_path, file_info) tuples
+    """
+    chunk = []
+    chunk_chars = 0
+    for file_path, file_info in file_items:
+        size = len(file_info["content"])
+        if chunk and (len(chunk) == max_files or chunk_chars + size > max_chars):
+            yield chunk
+            chunk = []
+            chunk_chars = 0
+        chunk.append((file_path, file_info))
+        chunk_chars += size
+    if chunk:
+        yield chunk
+
+
+class _ProgressThrottle:
+    """
+    Limit progress redraws to one per PROGRESS_MIN_INTERVAL seconds.
+
+    Each Streamlit update is a message to the browser, so when files finish
+    quickly (cache hits, small files) redrawing after every one costs more
+    than the work it reports. The final update is never skipped.
+    """
+
+    def __init__(self, total):
+        self.total = total
+        self._last = 0.0
+
+    def ready(self, completed):
+        """Return True if the caller should redraw progress now."""
+        now = time.monotonic()
+        if completed == self.total or now - self._last >= PROGRESS_MIN_INTERVAL:
+            self._last = now
+            return True
+        return False
+
+
+def dedupe_files_by_digest(files):
+    """
+    Group files with identical contents so each is documented only once.
+
+    Files only count as duplicates when their language matches as well,
+    since the language shapes the prompt.
+
+    Args:
+        files: Dictionary of extracted files
+
+    Returns:
+        Tuple of (unique_files, duplicates). unique_files maps one path per
+        distinct content to its info; duplicates maps that path to the other
+        paths sharing its content.
+    """
+    unique_files = {}
+    duplicates = defaultdict(list)
+    first_path = {}
+    for file_path, file_info in files.items():
+        digest = file_info.get("digest") or content_digest(
+            file_info["content"].encode("utf-8")
+        )
+        key = (digest, file_info["language"])
+        if key in first_path:
+            duplicates[first_path[key]].append(file_path)
+        else:
+            first_path[key] = file_path
+            unique_files[file_path] = file_info
+    return unique_files, duplicates
+
+
+def _store_directory_structure(documentation, directory_tree):
+    """Store the ASCII tree and Mermaid diagram returned by build_directory_tree."""
+    tree, ascii_tree, mermaid_code = directory_tree
+    documentation["__directory_structure__"] = ascii_tree
+    documentation["__mermaid_diagram__"] = MERMAID_MD_TEMPLATE % mermaid_code
+
+
+def largest_first(files):
+    """
+    Order files by descending size so the slowest requests start first.
+
+    Longest-processing-time-first ordering keeps one large file from
+    finishing alone at the end of a run while the other workers sit idle.
+
+    Args:
+        files: Dictionary of extracted files
+
+    Returns:
+        New dictionary with the same items, largest file first
+    """
+    return dict(
+        sorted(
+            files.items(),
+            key=lambda item: item[1].get("size_bytes", len(item[1]["content"])),
+            reverse=True,
+        )
+    )
+
+
+def copy_duplicate_documentation(documentation, duplicates):
+    """
+    Fill in documentation for duplicate files from their documented twin.
+
+    Only the 'Documentation for <path>' title the prompt asks for is
+    rewritten per copy; the rest of the text is copied unchanged.
+
+    Args:
+        documentation: Generated documentation, updated in place
+        duplicates: Mapping returned by dedupe_files_by_digest
+    """
+    for file_path, copies in duplicates.items():
+        doc = documentation.get(file_path)
+        if doc is None:
+            continue
+        for copy_path in copies:
+            documentation[copy_path] = retitle_documentation(doc, file_path, copy_path)
+
+
+def generate_all_documentation_concurrent(
+    files, config, max_workers=DEFAULT_FULL_CONCURRENCY_THREADS
+):
     """
     Generate documentation for all files concurrently with Streamlit threading.
 
@@ -80,114 +326,111 @@ def generate_all_documentation_concurrent(files, config, max_workers=3):
 
     # Initialize client
     try:
-        client = initialize_client(config["api_key"])
+        client = with_rate_cap(
+            initialize_client(config["api_key"]), config["requests_per_minute"]
+        )
     except Exception as e:
         st.error(f"Failed to initialize Claude client: {str(e)}")
         return None
 
-    # Generate directory structure visualization if selected
+    # Build the directory tree on the worker pool so it overlaps the API calls
+    tree_future = None
     if config["generate_dir_structure"] and len(files) > 1:
-        with st.spinner("Generating directory structure visualization..."):
-            tree, ascii_tree, mermaid_code = build_directory_tree(files)
+        tree_future = _get_executor().submit(build_directory_tree, files)
 
-            # Store both visualizations
-            documentation["__directory_structure__"] = ascii_tree
-
-            # Also create a separate entry for the Mermaid diagram
-            documentation["__mermaid_diagram__"] = f"""
-# Project Directory Structure Mermaid Code
-
-```mermaid
-{mermaid_code}
-```
-"""
+    # Identical files are documented once and copied afterwards
+    files_to_document, duplicates = dedupe_files_by_digest(files)
+    files_to_document = largest_first(files_to_document)
 
     # Setup progress tracking
-    total_files = len(files)
+    total_files = len(files_to_document)
     progress_bar = st.progress(0)
     status_container = st.empty()
-
-    # Create a queue for progress updates
-    progress_queue = queue.Queue()
-    completed_files = []
-
-    # Function to update progress from main thread
-    def update_progress_display():
-        while len(completed_files) < total_files:
-            try:
-                # Non-blocking check for progress updates
-                while not progress_queue.empty():
-                    file_path, success = progress_queue.get_nowait()
-                    completed_files.append(file_path)
-
-                    # Update progress bar
-                    progress = len(completed_files) / total_files
-                    progress_bar.progress(progress)
-
-                    # Update status
-                    if success:
-                        status_container.success(
-                            f"Completed: {file_path} ({len(completed_files)}/{total_files})"
-                        )
-                    else:
-                        status_container.error(
-                            f"Failed: {file_path} ({len(completed_files)}/{total_files})"
-                        )
-
-                # Small delay to prevent busy waiting
-                time.sleep(0.1)
-
-            except queue.Empty:
-                time.sleep(0.1)
-                continue
-
-    # Start progress updater in a separate thread
-    progress_thread = threading.Thread(target=update_progress_display, daemon=True)
-    progress_thread.start()
+    throttle = _ProgressThrottle(total_files)
 
     try:
         # Process files concurrently
         with st.spinner("Generating file documentation with full concurrency..."):
-            with ThreadPoolExecutor(max_workers=max_workers) as executor:
-                # Prepare arguments for each file
-                file_args = [
-                    (file_path, file_info, client, config["doc_level"])
-                    for file_path, file_info in files.items()
-                ]
-
-                # Submit all tasks
-                future_to_file = {
-                    executor.submit(generate_file_documentation_worker, args): args[0]
-                    for args in file_args
-                }
-
-                # Process results as they complete
-                for future in as_completed(future_to_file):
-                    file_path = future_to_file[future]
+            # Workers spend their time waiting on the network, so the CPU
+            # count is no bound; only the shared pool's size is
+            pool_size = min(max_workers, DOC_EXECUTOR_MAX_WORKERS)
+            executor = _get_executor()
+            file_items = iter(files_to_document.items())
+            future_to_file = {}
+
+            def submit(count):
+                for file_path, file_info in islice(file_items, count):
+                    future = executor.submit(
+                        generate_file_documentation_worker,
+                        file_path,
+                        file_info,
+                        client,
+                        config["doc_level"],
+                    )
+                    future_to_file[future] = file_path
+
+            # Direct handoff: only pool_size tasks are in flight, and a new
+            # one is submitted each time an earlier one finishes
+            submit(pool_size)
+
+            # Only the script thread waits on futures and touches Streamlit
+            completed = 0
+            fatal_error = None
+            pop_file = future_to_file.pop
+            redraw_ready = throttle.ready
+            while future_to_file:
+                done, _ = wait(future_to_file, return_when=FIRST_COMPLETED)
+                for future in done:
+                    completed += 1
+                    file_path = pop_file(future)
                     try:
-                        result_file_path, doc, success = future.result()
-                        documentation[result_file_path] = doc
+                        file_path, doc, success, _ = future.result()
+                    except Exception as e:
+                        doc = f"Error processing {file_path}: {str(e)}"
+                        success = False
+                        if is_fatal_api_error(e):
+                            fatal_error = e
+                    documentation[file_path] = doc
+
+                    # Failures are always reported; successes only on redraws
+                    redraw = redraw_ready(completed)
+                    if redraw:
+                        progress_bar.progress(completed / total_files)
+                    if not success:
+                        status_container.error(
+                            f"Failed: {file_path} ({completed}/{total_files})"
+                        )
+                    elif redraw:
+                        status_container.success(
+                            f"Completed: {file_path} ({completed}/{total_files})"
+                        )
 
-                        # Signal progress update through queue
-                        progress_queue.put((result_file_path, success))
+                # Every remaining request would fail the same way
+                if fatal_error is not None:
+                    for future in future_to_file:
+                        future.cancel()
+                    break
 
-                    except Exception as e:
-                        error_msg = f"Error processing {file_path}: {str(e)}"
-                        documentation[file_path] = error_msg
-                        progress_queue.put((file_path, False))
+                submit(len(done))
 
     except Exception as e:
         st.error(f"Error in concurrent processing: {str(e)}")
         return None
 
+    if fatal_error is not None:
+        st.error(f"Stopped generating documentation: {str(fatal_error)}")
+        return None
+
+    if tree_future is not None:
+        _store_directory_structure(documentation, tree_future.result())
+    copy_duplicate_documentation(documentation, duplicates)
+
     # generate project overview based on actual documentation content
     if config["generate_overview"] and len(files) > 1:
         with st.spinner("Generating content-based project overview..."):
-            documentation["__project_overview__"] = generate_content_based_overview(
-                documentation, files, client
+            documentation["__project_overview__"] = (
+                generate_content_based_overview_cached(documentation, files, client)
             )
-    # Wait for progress thread to finish
-    progress_thread.join(timeout=1.0)
 
     # Final progress update
     progress_bar.progress(1.0)
@@ -215,108 +458,471 @@ def generate_all_documentation_batch(files, config, batch_size=3):
     Returns:
         Dictionary containing all generated documentation
     """
-    documentation = {}
     start_time = time.time()
 
     # Initialize client
     try:
-        from utils.api import initialize_client
-
-        client = initialize_client(config["api_key"])
+        client = with_rate_cap(
+            initialize_client(config["api_key"]), config["requests_per_minute"]
+        )
     except Exception as e:
         st.error(f"Failed to initialize Claude client: {str(e)}")
         return None
 
-    # Generate directory structure if selected
+    # Build the directory tree on the worker pool so it overlaps the API calls
+    tree_future = None
     if config["generate_dir_structure"] and len(files) > 1:
-        with st.spinner("Generating directory structure visualization..."):
-            from utils.visualization import build_directory_tree
-
-            tree, ascii_tree, mermaid_code = build_directory_tree(files)
+        tree_future = _get_executor().submit(build_directory_tree, files)
 
-            documentation["__directory_structure__"] = ascii_tree
-            documentation["__mermaid_diagram__"] = f"""
-# Project Directory Structure Mermaid Code
+    # Identical files are documented once and copied afterwards
+    files_to_document, duplicates = dedupe_files_by_digest(files)
+    files_to_document = largest_first(files_to_document)
 
-```mermaid
-{mermaid_code}
-```
-"""
+    # Only files missing from the cache are grouped, so a cached file is
+    # never requested again just because it shares a group with a new one
+    documentation, files_to_request = lookup_cached_documentation(
+        files_to_document, config["doc_level"]
+    )
 
-    # Process files in batches
-    file_items = list(files.items())
-    total_files = len(file_items)
+    # Process files in batches; small files share a request
+    file_chunks = chunk_small_files(files_to_request.items())
+    total_files = len(files_to_document)
     progress_bar = st.progress(0)
     status_placeholder = st.empty()
+    throttle = _ProgressThrottle(total_files)
+
+    completed_count = len(documentation)
+    fatal_error = None
+    batch_num = 1
+    batch_first = completed_count
+    batch_start_time = time.time()
+    batch_successful = 0
+
+    with st.spinner("Generating file documentation in batches..."):
+        # One pool for the whole run; a new file starts as soon as any
+        # finishes, so a slow file no longer holds up the next batch
+        executor = _get_executor()
+        future_to_file = {}
+
+        def submit(count):
+            for chunk in islice(file_chunks, count):
+                future = executor.submit(
+                    generate_chunk_documentation_worker,
+                    chunk,
+                    client,
+                    config["doc_level"],
+                )
+                future_to_file[future] = chunk
+
+        submit(batch_size)
+        status_placeholder.info(f"📦 Processing Batch {batch_num}")
+
+        while future_to_file:
+            done, _ = wait(future_to_file, return_when=FIRST_COMPLETED)
+            for future in done:
+                chunk = future_to_file.pop(future)
+                try:
+                    results = future.result()
+                except Exception as e:
+                    error_msg = f"Worker exception: {str(e)}"
+                    if is_fatal_api_error(e):
+                        fatal_error = e
+                    results = [
+                        (file_path, None, False, error_msg) for file_path, _ in chunk
+                    ]
+
+                for result_file_path, doc, success, error_msg in results:
+                    if success:
+                        documentation[result_file_path] = doc
+                        batch_successful += 1
+                    else:
+                        documentation[result_file_path] = f"Error: {error_msg}"
+
+                # Advance the bar as files land, not once per batch
+                completed_count += len(results)
+                if throttle.ready(completed_count):
+                    progress_bar.progress(completed_count / total_files)
+
+                # Every batch_size completions close out a batch
+                batch_files = completed_count - batch_first
+                if batch_files >= batch_size or completed_count == total_files:
+                    batch_elapsed = time.time() - batch_start_time
+                    status_placeholder.success(
+                        f"✅ Batch {batch_num} completed in {batch_elapsed:.2f}s "
+                        f"({batch_successful}/{batch_files} files successful)"
+                    )
+                    batch_num += 1
+                    batch_first = completed_count
+                    batch_start_time = time.time()
+                    batch_successful = 0
+
+            # Every remaining request would fail the same way
+            if fatal_error is not None:
+                for future in future_to_file:
+                    future.cancel()
+                break
+
+            submit(len(done))
+
+    if fatal_error is not None:
+        st.error(f"Stopped generating documentation: {str(fatal_error)}")
+        return None
 
-    completed_count = 0
+    if tree_future is not None:
+        _store_directory_structure(documentation, tree_future.result())
+    copy_duplicate_documentation(documentation, duplicates)
 
-    for batch_num, i in enumerate(range(0, total_files, batch_size), 1):
-        batch = file_items[i : i + batch_size]
-        batch_start_time = time.time()
+    # generate project overview based on actual documentation content
+    if config["generate_overview"] and len(files) > 1:
+        with st.spinner("Generating content-based project overview..."):
+            documentation["__project_overview__"] = (
+                generate_content_based_overview_cached(documentation, files, client)
+            )
 
-        file_names = [file_path.split("/")[-1] for file_path, _ in batch]
-        status_placeholder.info(
-            f"📦 Processing Batch {batch_num}: {', '.join(file_names)}"
-        )
+    # Final progress update
+    progress_bar.progress(1.0)
 
-        # Process current batch concurrently
-        batch_results = []
-        with st.spinner("Generating file documentation in batches..."):
-            with ThreadPoolExecutor(max_workers=min(batch_size, len(batch))) as executor:
-                future_to_file = {
-                    executor.submit(
-                        generate_file_documentation_worker,
-                        (file_path, file_info, client, config["doc_level"]),
-                    ): file_path
-                    for file_path, file_info in batch
-                }
+    # Display generation time
+    end_time = time.time()
+    processing_time = end_time - start_time
+    status_placeholder.success(
+        f"🎉 Documentation generated in {processing_time:.2f} seconds ({total_files} files)"
+    )
 
-                for future in as_completed(future_to_file):
-                    file_path = future_to_file[future]
-                    try:
-                        result_file_path, doc, success, error_msg = future.result()
+    return documentation
 
-                        if success:
-                            documentation[result_file_path] = doc
-                            batch_results.append((result_file_path, True))
-                        else:
-                            documentation[result_file_path] = f"Error: {error_msg}"
-                            batch_results.append((result_file_path, False))
 
-                        completed_count += 1
+@st.cache_resource(show_spinner=False)
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Start one event loop per process on a background thread.
 
-                    except Exception as e:
-                        error_msg = f"Worker exception: {str(e)}"
-                        documentation[file_path] = f"Error: {error_msg}"
-                        batch_results.append((file_path, False))
-                        completed_count += 1
-
-        # Update progress
-        batch_elapsed = time.time() - batch_start_time
-        successful = sum(1 for _, success in batch_results if success)
-
-        progress_bar.progress(completed_count / total_files)
-        status_placeholder.success(
-            f"✅ Batch {batch_num} completed in {batch_elapsed:.2f}s "
-            f"({successful}/{len(batch)} files successful)"
+    Keeping the loop alive across reruns lets the async client keep its
+    connection pool instead of reconnecting on every generation.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, name="docgen-async", daemon=True).start()
+    return loop
+
+
+@st.cache_resource(show_spinner=False)
+def _get_async_client(api_key: str):
+    """Create one async Claude client per API key, bound to the shared loop."""
+    return initialize_async_client(api_key)
+
+
+async def _document_files_async(files, client, doc_level, max_concurrent, results_queue):
+    """
+    Document every file on the event loop with at most max_concurrent requests.
+
+    Each result is pushed to results_queue as (file_path, documentation, success)
+    so the Streamlit script thread can report progress as files finish. None is
+    pushed last, however the run ends, so the reader never waits forever.
+
+    An API error that would fail every other file too ends the run: it is
+    raised and the requests still pending are cancelled.
+    """
+    tasks = []
+    try:
+        semaphore = asyncio.Semaphore(max_concurrent)
+
+        async def document_file(file_path, file_info):
+            async with semaphore:
+                try:
+                    doc = await generate_documentation_async(
+                        file_path, file_info, client, doc_level
+                    )
+                    results_queue.put((file_path, doc, True))
+                except Exception as e:
+                    if is_fatal_api_error(e):
+                        raise
+                    results_queue.put(
+                        (file_path, f"Error generating documentation: {str(e)}", False)
+                    )
+
+        tasks = [
+            asyncio.ensure_future(document_file(file_path, file_info))
+            for file_path, file_info in files.items()
+        ]
+        await asyncio.gather(*tasks)
+    finally:
+        for task in tasks:
+            task.cancel()
+        results_queue.put(None)
+
+
+def generate_all_documentation_async(
+    files, config, max_concurrent=DEFAULT_ASYNC_CONCURRENCY
+):
+    """
+    Generate documentation for all files with asyncio instead of worker threads.
+
+    Args:
+        files: Dictionary of extracted files
+        config: Configuration dictionary
+        max_concurrent: Maximum number of in-flight Claude requests
+
+    Returns:
+        Dictionary containing all generated documentation
+    """
+    start_time = time.time()
+
+    # Initialize clients; the sync one is used for the project overview
+    try:
+        client = with_rate_cap(
+            initialize_client(config["api_key"]), config["requests_per_minute"]
         )
+        async_client = with_rate_cap(
+            _get_async_client(config["api_key"]), config["requests_per_minute"]
+        )
+    except Exception as e:
+        st.error(f"Failed to initialize Claude client: {str(e)}")
+        return None
+
+    # Build the directory tree on the worker pool so it overlaps the API calls
+    tree_future = None
+    if config["generate_dir_structure"] and len(files) > 1:
+        tree_future = _get_executor().submit(build_directory_tree, files)
+
+    # Identical files are documented once and copied afterwards
+    files_to_document, duplicates = dedupe_files_by_digest(files)
+    files_to_document = largest_first(files_to_document)
+
+    # Files documented by an earlier run need no request
+    documentation, files_to_request = lookup_cached_documentation(
+        files_to_document, config["doc_level"]
+    )
+
+    # Setup progress tracking
+    total_files = len(files_to_document)
+    progress_bar = st.progress(0)
+    status_container = st.empty()
+    throttle = _ProgressThrottle(total_files)
+    results_queue = queue.Queue()
+    fatal_error = None
+
+    try:
+        with st.spinner("Generating file documentation asynchronously..."):
+            run = asyncio.run_coroutine_threadsafe(
+                _document_files_async(
+                    files_to_request,
+                    async_client,
+                    config["doc_level"],
+                    max_concurrent,
+                    results_queue,
+                ),
+                _get_event_loop(),
+            )
+
+            # Streamlit stops or reruns the script by raising from the next
+            # st call; cancel the run then too, not just on errors
+            try:
+                next_result = results_queue.get
+                redraw_ready = throttle.ready
+                completed = len(documentation)
+                while True:
+                    result = next_result()
+                    # None means the coroutine ended, normally or not
+                    if result is None:
+                        break
+                    file_path, doc, success = result
+                    completed += 1
+                    documentation[file_path] = doc
+                    if success:
+                        store_cached_documentation(
+                            file_path,
+                            files_to_request[file_path],
+                            doc,
+                            config["doc_level"],
+                        )
+
+                    # Failures are always reported; successes only on redraws
+                    redraw = redraw_ready(completed)
+                    if redraw:
+                        progress_bar.progress(completed / total_files)
+                    if not success:
+                        status_container.error(
+                            f"Failed: {file_path} ({completed}/{total_files})"
+                        )
+                    elif redraw:
+                        status_container.success(
+                            f"Completed: {file_path} ({completed}/{total_files})"
+                        )
+
+                # Re-raises whatever ended the coroutine early
+                try:
+                    run.result()
+                except Exception as e:
+                    if not is_fatal_api_error(e):
+                        raise
+                    fatal_error = e
+            finally:
+                run.cancel()
+
+    except Exception as e:
+        st.error(f"Error in async processing: {str(e)}")
+        return None
+
+    if fatal_error is not None:
+        st.error(f"Stopped generating documentation: {str(fatal_error)}")
+        return None
+
+    if tree_future is not None:
+        _store_directory_structure(documentation, tree_future.result())
+    copy_duplicate_documentation(documentation, duplicates)
 
     # generate project overview based on actual documentation content
     if config["generate_overview"] and len(files) > 1:
         with st.spinner("Generating content-based project overview..."):
-            documentation["__project_overview__"] = generate_content_based_overview(
-                documentation, files, client
+            documentation["__project_overview__"] = (
+                generate_content_based_overview_cached(documentation, files, client)
             )
 
     # Final progress update
     progress_bar.progress(1.0)
+    status_container.success(
+        f"Documentation generation completed! ({total_files} files processed)"
+    )
 
     # Display generation time
     end_time = time.time()
     processing_time = end_time - start_time
-    status_placeholder.success(
-        f"🎉 Documentation generated in {processing_time:.2f} seconds ({total_files} files)"
+    st.success(f"Documentation generated in {processing_time:.2f} seconds")
+
+    return documentation
+
+
+def generate_all_documentation_message_batch(files, config):
+    """
+    Generate documentation for all files with a single Message Batches API job.
+
+    The batch is billed at half the per-request price and is not subject to
+    the per-request rate limit, but results only arrive once the whole batch
+    has ended, which can take minutes for large archives.
+
+    Args:
+        files: Dictionary of extracted files
+        config: Configuration dictionary
+
+    Returns:
+        Dictionary containing all generated documentation
+    """
+    start_time = time.time()
+
+    # Initialize client
+    try:
+        client = with_rate_cap(
+            initialize_client(config["api_key"]), config["requests_per_minute"]
+        )
+    except Exception as e:
+        st.error(f"Failed to initialize Claude client: {str(e)}")
+        return None
+
+    # Build the directory tree on the worker pool so it overlaps the API calls
+    tree_future = None
+    if config["generate_dir_structure"] and len(files) > 1:
+        tree_future = _get_executor().submit(build_directory_tree, files)
+
+    # Identical files are documented once and copied afterwards
+    files_to_document, duplicates = dedupe_files_by_digest(files)
+
+    # Files documented by an earlier run are left out of the batch
+    documentation, files_to_request = lookup_cached_documentation(
+        files_to_document, config["doc_level"]
     )
 
+    # Setup progress tracking
+    total_files = len(files_to_document)
+    cached_files = len(documentation)
+    progress_bar = st.progress(0)
+    status_container = st.empty()
+    failed = 0
+
+    try:
+        with st.spinner("Waiting for the message batch to finish..."):
+            # Skip the batch entirely when every file was cached
+            if files_to_request:
+                batch_id, custom_ids = create_documentation_batch(
+                    files_to_request, client, config["doc_level"]
+                )
+                status_container.info(
+                    f"Submitted batch {batch_id} ({len(files_to_request)} files)"
+                )
+
+                # Streamlit stops or reruns the script by raising from the next
+                # st call; an abandoned batch is cancelled then too, so it does
+                # not keep running on the key
+                ended = False
+                deadline = time.monotonic() + MESSAGE_BATCH_MAX_WAIT
+                try:
+                    while True:
+                        batch = client.messages.batches.retrieve(batch_id)
+                        counts = batch.request_counts
+                        completed = cached_files + (
+                            counts.succeeded
+                            + counts.errored
+                            + counts.canceled
+                            + counts.expired
+                        )
+                        progress_bar.progress(completed / total_files)
+                        status_container.info(
+                            f"Batch {batch.processing_status}: {completed}/{total_files} files"
+                        )
+                        if batch.processing_status == "ended":
+                            ended = True
+                            break
+                        if time.monotonic() >= deadline:
+                            raise TimeoutError(
+                                f"batch {batch_id} did not finish within "
+                                f"{MESSAGE_BATCH_MAX_WAIT} seconds and was cancelled"
+                            )
+                        time.sleep(MESSAGE_BATCH_POLL_INTERVAL)
+                finally:
+                    if not ended:
+                        try:
+                            client.messages.batches.cancel(batch_id)
+                        except Exception:
+                            # Never mask the error or stop that ended the wait
+                            pass
+
+                for file_path, doc, success in iter_documentation_batch_results(
+                    batch_id, custom_ids, client
+                ):
+                    documentation[file_path] = doc
+                    if success:
+                        store_cached_documentation(
+                            file_path,
+                            files_to_request[file_path],
+                            doc,
+                            config["doc_level"],
+                        )
+                    else:
+                        failed += 1
+
+    except Exception as e:
+        st.error(f"Error in message batch processing: {str(e)}")
+        return None
+
+    if tree_future is not None:
+        _store_directory_structure(documentation, tree_future.result())
+    copy_duplicate_documentation(documentation, duplicates)
+
+    # generate project overview based on actual documentation content
+    if config["generate_overview"] and len(files) > 1:
+        with st.spinner("Generating content-based project overview..."):
+            documentation["__project_overview__"] = (
+                generate_content_based_overview_cached(documentation, files, client)
+            )
+
+    # Final progress update
+    progress_bar.progress(1.0)
+    status_container.success(
+        f"Documentation generation completed! ({total_files - failed}/{total_files} files successful)"
+    )
+
+    # Display generation time
+    end_time = time.time()
+    processing_time = end_time - start_time
+    st.success(f"Documentation generated in {processing_time:.2f} seconds")
+
     return documentation
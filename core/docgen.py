@@ -5,16 +5,24 @@ Core documentation generation functionality.
 import time
 import streamlit as st
 
+from config.constants import MERMAID_MD_TEMPLATE
 from utils.api import (
     initialize_client,
     generate_project_overview_simple,
-    generate_documentation,
-    generate_content_based_overview,
+    with_rate_cap,
 )
 from utils.archive import extract_files_from_archive
 from utils.visualization import build_directory_tree
 from utils.ui import display_generation_time
-from core.concurrent_docgen import process_archive
+from core.concurrent_docgen import (
+    process_archive,
+    dedupe_files_by_digest,
+    copy_duplicate_documentation,
+)
+from core._cache import (
+    generate_content_based_overview_cached,
+    generate_documentation_cached,
+)
 
 def generate_all_documentation(files, config):
     """
@@ -32,7 +40,9 @@ def generate_all_documentation(files, config):
 
     # Initialize client
     try:
-        client = initialize_client(config["api_key"])
+        client = with_rate_cap(
+            initialize_client(config["api_key"]), config["requests_per_minute"]
+        )
     except Exception as e:
         st.error(f"Failed to initialize Claude client: {str(e)}")
         return None
@@ -46,26 +56,25 @@ def generate_all_documentation(files, config):
             documentation["__directory_structure__"] = ascii_tree
 
             # Also create a separate entry for the Mermaid diagram
-            documentation["__mermaid_diagram__"] = f"""
-    # Project Directory Structure Mermaid Code
-    
-    ```mermaid
-    {mermaid_code}
-    ```
-    """
+            documentation["__mermaid_diagram__"] = MERMAID_MD_TEMPLATE % mermaid_code
+
+    # Identical files are documented once and copied afterwards
+    files_to_document, duplicates = dedupe_files_by_digest(files)
 
     # Process each file
-    total_files = len(files)
-    for i, (file_path, file_info) in enumerate(files.items()):
+    total_files = len(files_to_document)
+    for i, (file_path, file_info) in enumerate(files_to_document.items()):
         with st.spinner("Generating file documentation sequentially..."):
-            documentation[file_path] = generate_documentation(
+            documentation[file_path] = generate_documentation_cached(
                 file_path, file_info, client, config["doc_level"]
             )
+    copy_duplicate_documentation(documentation, duplicates)
+
     # Generate project overview if selected
     if config["generate_overview"] and len(files) > 1:
         with st.spinner("Generating project overview..."):
-            documentation["__project_overview__"] = generate_content_based_overview(
-                documentation, files, client
+            documentation["__project_overview__"] = (
+                generate_content_based_overview_cached(documentation, files, client)
             )
     # Display generation time
     display_generation_time(start_time)
@@ -3,44 +3,79 @@ Claude API integration utilities.
 """
 
 import os
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 import anthropic
+import httpx
 import streamlit as st
 from config.constants import (
     DEFAULT_MODEL,
     DEFAULT_TEMPERATURE,
-    BASIC_LEVEL_MAX_TOKENS,
-    COMPREHENSIVE_LEVEL_MAX_TOKENS,
-    EXPERT_LEVEL_MAX_TOKENS,
+    DEFAULT_DOC_LEVEL,
+    DOC_LEVEL_MAX_TOKENS,
     PROJECT_OVERVIEW_MAX_TOKENS,
+    DOC_PROMPT_VERSION,
+    MULTI_FILE_MAX_TOKENS,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_KEEPALIVE_EXPIRY,
+    OVERVIEW_SUMMARY_WORKERS,
 )
-from typing import Dict, Any, Optional, List, Tuple
-from dotenv import load_dotenv
+from typing import Dict, Any, Optional, List, Tuple, Iterator
+from utils.ratelimit import cap_client_rate, client_rate_cap, rate_limiter_for
+from utils.debug import is_debug_enabled
 import re
 
 
-# Load environment variables
-load_dotenv()
+try:
+    import h2  # noqa: F401
+except ImportError:  # optional; httpx needs it for HTTP/2, else HTTP/1.1 is used
+    h2 = None
 
 
+@functools.lru_cache(maxsize=None)
+def _env(name: str) -> Optional[str]:
+    """
+    Read an environment variable once.
+
+    Read on first use rather than at import, so the .env file loaded by
+    app_concurrent's _load_env is seen; the environment does not change
+    after that while the app is running.
+    """
+    return os.getenv(name)
+
+
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=HTTP_MAX_CONNECTIONS,
+    max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    keepalive_expiry=HTTP_KEEPALIVE_EXPIRY,
+)
+
+# Anthropic API key format, checked on every rerun
+_API_KEY_RE = re.compile(r"^sk-ant-api03-[a-zA-Z0-9_-]{95}$")
+
+
+# Pure given the demo settings read by _env, so each rerun's repeat checks
+# of the same key are answered from the cache
+@functools.lru_cache(maxsize=32)
 def _is_valid_api_key(api_key: str) -> bool:
     if not api_key:
         return False
 
-    demo_pw = os.getenv("DEMO_PW")
     api_key = api_key.strip()
 
     # Allow demo mode
-    if api_key.lower() == demo_pw and _check_is_demo_key_valid():
+    if api_key.lower() == _env("DEMO_PW") and _check_is_demo_key_valid():
         return True
 
     # Check Anthropic format
-    pattern = r"^sk-ant-api03-[a-zA-Z0-9_-]{95}$"
-    return bool(re.match(pattern, api_key))
+    return bool(_API_KEY_RE.match(api_key))
 
 
+@functools.lru_cache(maxsize=1)
 def _check_is_demo_key_valid() -> bool:
-    pattern = r"^sk-ant-api03-[a-zA-Z0-9_-]{95}$"
-    return bool(re.match(pattern, os.getenv("DEMO_KEY")))
+    return bool(_API_KEY_RE.match(_env("DEMO_KEY")))
 
 
 def _invalid_api_key_error_message():
@@ -51,14 +86,12 @@ def _check_api_input(user_input) -> Optional[str]:
     if not user_input:
         return None
 
-    demo_pw = os.getenv("DEMO_PW")
-
     # Validate input
     if _is_valid_api_key(user_input):
-        if user_input.lower() == demo_pw:
+        if user_input.lower() == _env("DEMO_PW"):
             st.success("Demo mode activated. Some features will be disabled.")
-            st.session_state.anthropic_api_key = demo_pw
-            return os.getenv("DEMO_KEY")
+            st.session_state.anthropic_api_key = _env("DEMO_PW")
+            return _env("DEMO_KEY")
         else:
             st.success(
                 "Valid API key entered. Note: Your key is not stored or recorded anywhere else."
@@ -72,8 +105,7 @@ def _check_api_input(user_input) -> Optional[str]:
 def get_api_key() -> Optional[str]:
     """API key input with validation."""
 
-    api_key = os.getenv("ANTHROPIC_API_KEY")
-    demo_pw = os.getenv("DEMO_PW")
+    api_key = _env("ANTHROPIC_API_KEY")
     if api_key and _is_valid_api_key(api_key):
         st.success("API key loaded from environment")
         return api_key
@@ -83,19 +115,24 @@ def get_api_key() -> Optional[str]:
         # Get key from session
         if "anthropic_api_key" in st.session_state:
             api_key = st.session_state.anthropic_api_key
-            if api_key == demo_pw and _check_is_demo_key_valid():
+            if api_key == _env("DEMO_PW") and _check_is_demo_key_valid():
                 st.warning("Demo Key loaded from session")
-                return os.getenv("DEMO_KEY")
+                return _env("DEMO_KEY")
             if _is_valid_api_key(api_key):
                 st.warning("API Key loaded from session")
                 return api_key
     return api_input
 
 
+@functools.lru_cache(maxsize=4)
 def initialize_client(api_key: str) -> anthropic.Anthropic:
     """
     Initialize the Anthropic client with the given API key.
 
+    Clients are memoized per key so later runs reuse the same connection
+    pool. The client is thread-safe, so worker threads can share it.
+    Concurrent requests are multiplexed over HTTP/2 when h2 is installed.
+
     Args:
         api_key: Anthropic API key
 
@@ -106,41 +143,221 @@ def initialize_client(api_key: str) -> anthropic.Anthropic:
         Exception: If client initialization fails
     """
     try:
-        return anthropic.Anthropic(api_key=api_key)
+        return anthropic.Anthropic(
+            api_key=api_key,
+            http_client=anthropic.DefaultHttpxClient(
+                http2=h2 is not None, limits=_HTTP_LIMITS
+            ),
+        )
     except Exception as e:
         raise Exception(f"Failed to initialize Claude client: {str(e)}")
 
 
-def get_language_prompt(language: str) -> str:
-    """Get a language-specific prompt enhancement."""
-    language_specific = {
-        "Python": """
+def initialize_async_client(api_key: str) -> anthropic.AsyncAnthropic:
+    """
+    Initialize the async Anthropic client with the given API key.
+
+    Args:
+        api_key: Anthropic API key
+
+    Returns:
+        Initialized AsyncAnthropic client
+
+    Raises:
+        Exception: If client initialization fails
+    """
+    try:
+        return anthropic.AsyncAnthropic(
+            api_key=api_key,
+            http_client=anthropic.DefaultAsyncHttpxClient(
+                http2=h2 is not None, limits=_HTTP_LIMITS
+            ),
+        )
+    except Exception as e:
+        raise Exception(f"Failed to initialize Claude client: {str(e)}")
+
+
+def with_rate_cap(client, requests_per_minute: float):
+    """
+    Copy a client with its own requests-per-minute cap.
+
+    The copy shares the original's connection pool and its key's rate
+    limiter; the cap can only slow down requests sent through the copy.
+
+    Args:
+        client: Anthropic or AsyncAnthropic client instance
+        requests_per_minute: Highest request rate for the copy
+
+    Returns:
+        Capped copy of the client
+    """
+    capped = client.with_options()
+    cap_client_rate(capped, requests_per_minute)
+    return capped
+
+
+def _acquire_rate_limit(client: anthropic.Anthropic):
+    """Wait for the client's own cap, then its key's limiter, and return the latter."""
+    cap = client_rate_cap(client)
+    if cap is not None:
+        cap.acquire()
+    limiter = rate_limiter_for(client.api_key)
+    limiter.acquire()
+    return limiter
+
+
+async def _acquire_rate_limit_async(client: anthropic.AsyncAnthropic):
+    """Async counterpart of _acquire_rate_limit."""
+    cap = client_rate_cap(client)
+    if cap is not None:
+        await cap.acquire_async()
+    limiter = rate_limiter_for(client.api_key)
+    await limiter.acquire_async()
+    return limiter
+
+
+def _create_message(client: anthropic.Anthropic, **kwargs):
+    """
+    Send a Messages API request through the client's rate limiters.
+
+    Rate limit headers on the response (or on a 429) are fed back into the
+    key's limiter so later requests wait instead of burning retries.
+    """
+    limiter = _acquire_rate_limit(client)
+    try:
+        raw = client.messages.with_raw_response.create(**kwargs)
+    except anthropic.RateLimitError as e:
+        limiter.observe(e.response.headers)
+        raise
+    limiter.observe(raw.headers)
+    return raw.parse()
+
+
+async def _create_message_async(client: anthropic.AsyncAnthropic, **kwargs):
+    """Async counterpart of _create_message."""
+    limiter = await _acquire_rate_limit_async(client)
+    try:
+        raw = await client.messages.with_raw_response.create(**kwargs)
+    except anthropic.RateLimitError as e:
+        limiter.observe(e.response.headers)
+        raise
+    limiter.observe(raw.headers)
+    return raw.parse()
+
+
+def is_fatal_api_error(error: Exception) -> bool:
+    """
+    Check whether an API error will fail every later request as well.
+
+    Authentication and permission errors, and an exhausted credit balance,
+    are not fixed by moving on to the next file.
+    """
+    if isinstance(
+        error, (anthropic.AuthenticationError, anthropic.PermissionDeniedError)
+    ):
+        return True
+    return isinstance(error, anthropic.BadRequestError) and "credit balance" in str(
+        error
+    )
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """
+    Check whether an API error means the rate limit was hit.
+
+    Splitting the failed work into more requests would only add to the load.
+    """
+    return isinstance(error, anthropic.RateLimitError)
+
+
+_LANGUAGE_PROMPTS = {
+    "Python": """
         For Python files, also include:
         - Docstring format compliance (Google style, NumPy, etc.)
         - Type hints usage
         - Recommended improvements to code organization
         """,
-        "JavaScript": """
+    "JavaScript": """
         For JavaScript files, also include:
         - ES6+ feature usage
         - Module pattern analysis
         - Potential browser compatibility issues
         """,
-        "TypeScript": """
+    "TypeScript": """
         For TypeScript files, also include:
         - Type system usage analysis
         - Interface and type definitions overview
         - Compilation target considerations
         """,
-        "Java": """
+    "Java": """
         For Java files, also include:
         - Class hierarchy analysis
         - Design patterns used
         - Exception handling overview
         """,
-    }
+}
 
-    return language_specific.get(language, "")
+
+def get_language_prompt(language: str) -> str:
+    """Get a language-specific prompt enhancement."""
+    return _LANGUAGE_PROMPTS.get(language, "")
+
+
+_DETAIL_INSTRUCTIONS = {
+    "basic": "Provide a basic overview with essential information only.",
+    "comprehensive": "Provide comprehensive documentation with a good balance of detail.",
+    "expert": "Provide extremely detailed documentation with advanced insights and best practices.",
+}
+
+
+def _detail_for_level(doc_level: str) -> Tuple[str, int]:
+    """Return the detail instruction and max tokens for a documentation level."""
+    # Unknown levels fall back to the default, as the old if/elif chain did
+    if doc_level not in DOC_LEVEL_MAX_TOKENS:
+        doc_level = DEFAULT_DOC_LEVEL
+    return _DETAIL_INSTRUCTIONS[doc_level], DOC_LEVEL_MAX_TOKENS[doc_level]
+
+
+@functools.lru_cache(maxsize=128)
+def _documentation_prompt_template(
+    doc_level: str, language: str, template_version: str
+) -> Tuple[str, str]:
+    """
+    Build the static parts of the per-file documentation prompt.
+
+    Args:
+        doc_level: Level of detail for documentation
+        language: Language of the file being documented
+        template_version: Prompt version, so edits to the template miss the cache
+
+    Returns:
+        Tuple of (head, tail) text that goes around the file path and content
+    """
+    detail_instruction, _ = _detail_for_level(doc_level)
+
+    # Get language-specific prompting
+    language_specific = get_language_prompt(language)
+
+    head = f"""
+    Please generate {doc_level} documentation for the following {language} file.
+    {detail_instruction}
+    
+    Include:
+    1. Overall purpose and functionality
+    2. Detailed function/class documentation with parameters and return values
+    3. Code structure overview
+    4. Dependencies and requirements
+    5. Usage examples where appropriate
+    6. Potential issues or areas for improvement
+    
+    {language_specific}
+    
+    File: """
+    tail = """
+    
+    Format the documentation in clean, well-structured markdown. Format the title as 'Documentation for file_path' where file_path is the file path. DO NOT DEVIATE FROM THIS TITLE FORMAT.
+    """
+    return head, tail
 
 
 def generate_documentation(
@@ -148,6 +365,7 @@ def generate_documentation(
     file_info: Dict[str, Any],
     client: anthropic.Anthropic,
     doc_level: str = "comprehensive",
+    raise_errors: bool = False,
 ) -> str:
     """
     Generate documentation for a single file using Claude API.
@@ -157,34 +375,136 @@ def generate_documentation(
         file_info: Dict containing file content and language
         client: Anthropic client instance
         doc_level: Level of detail for documentation ("basic", "comprehensive", "expert")
+        raise_errors: Re-raise API errors instead of returning an error message
 
     Returns:
         Generated documentation text
     """
+    try:
+        response = _create_message(
+            client, **_documentation_request(file_path, file_info, doc_level)
+        )
+        if is_debug_enabled():
+            st.warning("calling api in gen doc")
+        return response.content[0].text
+    except Exception as e:
+        if raise_errors:
+            raise
+        return f"Error generating documentation: {str(e)}"
+
+
+async def generate_documentation_async(
+    file_path: str,
+    file_info: Dict[str, Any],
+    client: anthropic.AsyncAnthropic,
+    doc_level: str = "comprehensive",
+) -> str:
+    """
+    Generate documentation for a single file using the async Claude client.
+
+    Args:
+        file_path: Path of the file within the archive
+        file_info: Dict containing file content and language
+        client: AsyncAnthropic client instance
+        doc_level: Level of detail for documentation ("basic", "comprehensive", "expert")
+
+    Returns:
+        Generated documentation text
+
+    Raises:
+        Exception: If the API call fails
+    """
+    response = await _create_message_async(
+        client, **_documentation_request(file_path, file_info, doc_level)
+    )
+    return response.content[0].text
+
+
+def _documentation_request(
+    file_path: str, file_info: Dict[str, Any], doc_level: str
+) -> Dict[str, Any]:
+    """Build the Messages API arguments for documenting a single file."""
     content = file_info["content"]
     language = file_info["language"]
 
-    # Determine detail level
-    if doc_level == "basic":
-        detail_instruction = "Provide a basic overview with essential information only."
-        max_tokens = BASIC_LEVEL_MAX_TOKENS
-    elif doc_level == "expert":
-        detail_instruction = "Provide extremely detailed documentation with advanced insights and best practices."
-        max_tokens = EXPERT_LEVEL_MAX_TOKENS
-    else:
-        detail_instruction = (
-            "Provide comprehensive documentation with a good balance of detail."
-        )
-        max_tokens = COMPREHENSIVE_LEVEL_MAX_TOKENS
+    _, max_tokens = _detail_for_level(doc_level)
 
-    # Get language-specific prompting
-    language_specific = get_language_prompt(language)
+    # Only the file path and content vary between files of the same language
+    head, tail = _documentation_prompt_template(
+        doc_level, language, DOC_PROMPT_VERSION
+    )
+    prompt = f"""{head}{file_path}
+    
+    ```{language.lower()}
+    {content}
+    ```{tail}"""
+
+    return {
+        "model": DEFAULT_MODEL,
+        "max_tokens": max_tokens,
+        "temperature": DEFAULT_TEMPERATURE,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+
+
+_MULTI_FILE_HEADING = re.compile(r"^## FILE: ", re.MULTILINE)
+
+
+def generate_documentation_multi(
+    files_subset: List[Tuple[str, Dict[str, Any]]],
+    client: anthropic.Anthropic,
+    doc_level: str = "comprehensive",
+) -> Dict[str, str]:
+    """
+    Generate documentation for several small files in one Claude API call.
+
+    Files the response does not cover are left out of the result so the
+    caller can document them individually.
+
+    Args:
+        files_subset: List of (file_path, file_info) tuples
+        client: Anthropic client instance
+        doc_level: Level of detail for documentation ("basic", "comprehensive", "expert")
+
+    Returns:
+        Dictionary mapping file paths to their documentation
+
+    Raises:
+        Exception: If the API call fails
+    """
+    response = _create_message(
+        client, **_multi_documentation_request(files_subset, doc_level)
+    )
+    return _split_multi_documentation(
+        response.content[0].text, [file_path for file_path, _ in files_subset]
+    )
+
+
+def _multi_documentation_request(
+    files_subset: List[Tuple[str, Dict[str, Any]]], doc_level: str
+) -> Dict[str, Any]:
+    """Build the Messages API arguments for documenting several files at once."""
+    detail_instruction, max_tokens = _detail_for_level(doc_level)
+    languages = dict.fromkeys(file_info["language"] for _, file_info in files_subset)
+    language_specific = "".join(
+        get_language_prompt(language) for language in languages
+    )
 
+    file_blocks = "".join(
+        f"""
+    <<<FILE path={file_path}>>>
+    ```{file_info['language'].lower()}
+    {file_info['content']}
+    ```
+    <<<END>>>
+    """
+        for file_path, file_info in files_subset
+    )
     prompt = f"""
-    Please generate {doc_level} documentation for the following {language} file.
+    Please generate {doc_level} documentation for each of the following {len(files_subset)} files.
     {detail_instruction}
     
-    Include:
+    For each file include:
     1. Overall purpose and functionality
     2. Detailed function/class documentation with parameters and return values
     3. Code structure overview
@@ -194,27 +514,93 @@ def generate_documentation(
     
     {language_specific}
     
-    File: {file_path}
+    Each file is wrapped in <<<FILE path=...>>> and <<<END>>> markers.
+    {file_blocks}
     
-    ```{language.lower()}
-    {content}
-    ```
-    
-    Format the documentation in clean, well-structured markdown. Format the title as 'Documentation for file_path' where file_path is the file path. DO NOT DEVIATE FROM THIS TITLE FORMAT.
+    Write one section per file, in the order given. Start each section with a line reading '## FILE: file_path' and nothing else, where file_path is the file path. Follow it with that file's documentation in clean, well-structured markdown, titled 'Documentation for file_path'. DO NOT DEVIATE FROM THIS FORMAT.
     """
 
-    try:
-        response = client.messages.create(
-            model=DEFAULT_MODEL,
-            max_tokens=max_tokens,
-            temperature=DEFAULT_TEMPERATURE,
-            messages=[{"role": "user", "content": prompt}],
+    return {
+        "model": DEFAULT_MODEL,
+        "max_tokens": min(max_tokens * len(files_subset), MULTI_FILE_MAX_TOKENS),
+        "temperature": DEFAULT_TEMPERATURE,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+
+
+def _split_multi_documentation(text: str, file_paths: List[str]) -> Dict[str, str]:
+    """Split a multi-file response on its '## FILE: ' headings."""
+    expected = set(file_paths)
+    sections = {}
+    # The first part is whatever preamble came before the first heading
+    for section in _MULTI_FILE_HEADING.split(text)[1:]:
+        file_path, _, body = section.partition("\n")
+        file_path = file_path.strip().strip("`")
+        body = body.strip()
+        if file_path in expected and body:
+            sections[file_path] = body
+    return sections
+
+
+def create_documentation_batch(
+    files: Dict[str, Dict[str, Any]],
+    client: anthropic.Anthropic,
+    doc_level: str = "comprehensive",
+) -> Tuple[str, Dict[str, str]]:
+    """
+    Submit documentation requests for all files as one Message Batch.
+
+    Batch custom IDs only allow letters, digits, "-" and "_", so files are
+    numbered and the returned mapping translates IDs back to file paths.
+
+    Args:
+        files: Dictionary mapping file paths to their info
+        client: Anthropic client instance
+        doc_level: Level of detail for documentation
+
+    Returns:
+        Tuple of (batch_id, custom_id to file path mapping)
+    """
+    custom_ids = {}
+    requests = []
+    for index, (file_path, file_info) in enumerate(files.items()):
+        custom_id = f"file-{index}"
+        custom_ids[custom_id] = file_path
+        requests.append(
+            {
+                "custom_id": custom_id,
+                "params": _documentation_request(file_path, file_info, doc_level),
+            }
         )
-        if os.getenv("DEBUG") == "true":
-            st.warning("calling api in gen doc")
-        return response.content[0].text
-    except Exception as e:
-        return f"Error generating documentation: {str(e)}"
+
+    _acquire_rate_limit(client)
+    batch = client.messages.batches.create(requests=requests)
+    return batch.id, custom_ids
+
+
+def iter_documentation_batch_results(
+    batch_id: str, custom_ids: Dict[str, str], client: anthropic.Anthropic
+) -> Iterator[Tuple[str, str, bool]]:
+    """
+    Stream the results of an ended documentation batch.
+
+    Args:
+        batch_id: ID returned by create_documentation_batch
+        custom_ids: Mapping of custom IDs to file paths
+        client: Anthropic client instance
+
+    Yields:
+        Tuples of (file_path, documentation, success)
+    """
+    for entry in client.messages.batches.results(batch_id):
+        file_path = custom_ids[entry.custom_id]
+        result = entry.result
+        if result.type == "succeeded":
+            yield file_path, result.message.content[0].text, True
+        elif result.type == "errored":
+            yield file_path, f"Error generating documentation: {result.error}", False
+        else:
+            yield file_path, f"Error generating documentation: request {result.type}", False
 
 
 def generate_project_overview_simple(
@@ -276,13 +662,14 @@ def generate_project_overview_simple(
     """
 
     try:
-        response = client.messages.create(
+        response = _create_message(
+            client,
             model=DEFAULT_MODEL,
             max_tokens=PROJECT_OVERVIEW_MAX_TOKENS,
             temperature=DEFAULT_TEMPERATURE,
             messages=[{"role": "user", "content": prompt}],
         )
-        if os.getenv("DEBUG") == "true":
+        if is_debug_enabled():
             st.warning("calling api in gen overview")
         return response.content[0].text
     except Exception as e:
@@ -314,10 +701,14 @@ def generate_content_based_overview(
     if not file_docs:
         return "No file documentation available for overview generation."
 
+    # The direct prompt truncates each doc, so a handful of files always fits
+    # and there is no need to count tokens first
+    if len(file_docs) <= 5:
+        return _generate_overview_direct(file_docs, files, client)
+
     # Check total content size and decide strategy
-    total_content = "\n\n".join(file_docs.values())
-    estimated_tokens = len(total_content) // 3  # Rough estimate: 1 token ≈ 3 chars
     if not st.session_state.force_content_overview:
+        estimated_tokens = _count_doc_tokens(file_docs, client)
         if estimated_tokens < 15000:  # Small project - use all content
             return _generate_overview_direct(file_docs, files, client)
         elif estimated_tokens < 50000:  # Medium project - use summaries
@@ -328,6 +719,69 @@ def generate_content_based_overview(
         return _generate_overview_direct(file_docs, files, client)
 
 
+@st.cache_data(persist="disk", show_spinner=False, max_entries=2000)
+def _cached_message_text(
+    prompt: str, model: str, max_tokens: int, temperature: float, _client
+) -> str:
+    """
+    Send a single-prompt request, persisting the response text to disk.
+
+    Keyed on everything that shapes the response, so regenerating an
+    unchanged project reuses earlier summaries and overviews. API errors
+    are raised rather than returned so that failures are never cached.
+    """
+    response = _create_message(
+        _client,
+        model=model,
+        max_tokens=max_tokens,
+        temperature=temperature,
+        messages=[{"role": "user", "content": prompt}],
+    )
+    return response.content[0].text
+
+
+@st.cache_data(show_spinner=False, max_entries=64, ttl=3600)
+def _cached_token_count(model: str, docs: Tuple[str, ...], _client) -> int:
+    """
+    Count the tokens in the given docs, reused while the docs are unchanged.
+
+    The request goes through the client's rate limiters like every message
+    request. API errors are raised so that failures are never cached.
+    """
+    limiter = _acquire_rate_limit(_client)
+    try:
+        return _client.messages.count_tokens(
+            model=model,
+            messages=[
+                {
+                    "role": "user",
+                    "content": [{"type": "text", "text": doc} for doc in docs],
+                }
+            ],
+        ).input_tokens
+    except anthropic.RateLimitError as e:
+        limiter.observe(e.response.headers)
+        raise
+
+
+def _count_doc_tokens(file_docs: Dict[str, str], client: anthropic.Anthropic) -> int:
+    """
+    Count the tokens in the per-file docs with one token counting request.
+
+    Each doc is sent as its own text block so the corpus is never joined.
+    Falls back to a character-based estimate if the request fails.
+    """
+    try:
+        return _cached_token_count(
+            DEFAULT_MODEL, tuple(doc for doc in file_docs.values() if doc), client
+        )
+    except Exception:
+        # Summing lengths (plus the separators a join would add) avoids
+        # copying every doc into one string
+        total_chars = sum(map(len, file_docs.values())) + 2 * (len(file_docs) - 1)
+        return total_chars // 3  # Rough estimate: 1 token ≈ 3 chars
+
+
 def _generate_overview_direct(
     file_docs: Dict[str, str],
     files: Dict[str, Dict[str, Any]],
@@ -377,13 +831,13 @@ def _generate_overview_direct(
     """
 
     try:
-        response = client.messages.create(
-            model=DEFAULT_MODEL,
-            max_tokens=PROJECT_OVERVIEW_MAX_TOKENS,
-            temperature=DEFAULT_TEMPERATURE,
-            messages=[{"role": "user", "content": prompt}],
+        return _cached_message_text(
+            prompt,
+            DEFAULT_MODEL,
+            PROJECT_OVERVIEW_MAX_TOKENS,
+            DEFAULT_TEMPERATURE,
+            client,
         )
-        return response.content[0].text
     except Exception as e:
         return f"Error generating content-based overview: {str(e)}"
 
@@ -395,12 +849,23 @@ def _generate_overview_with_summaries(
 ) -> str:
     """Generate overview using file summaries for medium projects."""
 
-    # First, generate summaries for each file
-    file_summaries = {}
-
-    for file_path, doc_content in file_docs.items():
-        summary = _generate_file_summary(file_path, doc_content, client)
-        file_summaries[file_path] = summary
+    # First, generate summaries for each file; they are independent, so
+    # they run in parallel under the key's rate limiter
+    with ThreadPoolExecutor(max_workers=OVERVIEW_SUMMARY_WORKERS) as executor:
+        # map keeps file order so the overview prompt is deterministic
+        summaries = executor.map(
+            _generate_file_summary, file_docs, file_docs.values(), repeat(client)
+        )
+        file_summaries = dict(zip(file_docs, summaries))
+
+    # An overview of partial summaries would be cached as if it were complete;
+    # the summaries that did succeed are cached, so a retry only redoes these
+    failed = sum(summary is None for summary in file_summaries.values())
+    if failed:
+        return (
+            "Error generating summary-based overview: "
+            f"could not summarize {failed} of {len(file_summaries)} files"
+        )
 
     # Organize summaries by directory
     dir_structure = _organize_docs_by_directory(file_summaries, files)
@@ -441,13 +906,13 @@ def _generate_overview_with_summaries(
     """
 
     try:
-        response = client.messages.create(
-            model=DEFAULT_MODEL,
-            max_tokens=PROJECT_OVERVIEW_MAX_TOKENS,
-            temperature=DEFAULT_TEMPERATURE,
-            messages=[{"role": "user", "content": prompt}],
+        return _cached_message_text(
+            prompt,
+            DEFAULT_MODEL,
+            PROJECT_OVERVIEW_MAX_TOKENS,
+            DEFAULT_TEMPERATURE,
+            client,
         )
-        return response.content[0].text
     except Exception as e:
         return f"Error generating summary-based overview: {str(e)}"
 
@@ -461,12 +926,24 @@ def _generate_overview_hierarchical(
 
     # Step 1: Group files by directory and generate directory summaries
     dir_structure = _organize_docs_by_directory(file_docs, files)
-    directory_summaries = {}
-
-    for dir_path, docs in dir_structure.items():
-        dir_name = dir_path if dir_path else "Root"
-        dir_summary = _generate_directory_summary(dir_name, docs, client)
-        directory_summaries[dir_name] = dir_summary
+    dir_names = [dir_path if dir_path else "Root" for dir_path in dir_structure]
+
+    with ThreadPoolExecutor(max_workers=OVERVIEW_SUMMARY_WORKERS) as executor:
+        summaries = executor.map(
+            _generate_directory_summary,
+            dir_names,
+            dir_structure.values(),
+            repeat(client),
+        )
+        directory_summaries = dict(zip(dir_names, summaries))
+
+    # Same as for file summaries: never build on a failed directory summary
+    failed = sum(summary is None for summary in directory_summaries.values())
+    if failed:
+        return (
+            "Error generating hierarchical overview: "
+            f"could not summarize {failed} of {len(directory_summaries)} directories"
+        )
 
     # Step 2: Generate high-level overview from directory summaries
     dir_summary_text = "\n\n".join(
@@ -497,21 +974,21 @@ def _generate_overview_hierarchical(
     """
 
     try:
-        response = client.messages.create(
-            model=DEFAULT_MODEL,
-            max_tokens=PROJECT_OVERVIEW_MAX_TOKENS,
-            temperature=DEFAULT_TEMPERATURE,
-            messages=[{"role": "user", "content": prompt}],
+        return _cached_message_text(
+            prompt,
+            DEFAULT_MODEL,
+            PROJECT_OVERVIEW_MAX_TOKENS,
+            DEFAULT_TEMPERATURE,
+            client,
         )
-        return response.content[0].text
     except Exception as e:
         return f"Error generating hierarchical overview: {str(e)}"
 
 
 def _generate_file_summary(
     file_path: str, doc_content: str, client: anthropic.Anthropic
-) -> str:
-    """Generate a concise summary of a file's documentation."""
+) -> Optional[str]:
+    """Generate a concise summary of a file's documentation, or None on failure."""
 
     truncated_content = _truncate_content(doc_content, 2000)
 
@@ -529,21 +1006,17 @@ def _generate_file_summary(
     """
 
     try:
-        response = client.messages.create(
-            model=DEFAULT_MODEL,
-            max_tokens=300,
-            temperature=DEFAULT_TEMPERATURE,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        return response.content[0].text.strip()
-    except Exception as e:
-        return f"Summary generation failed for {file_path}"
+        return _cached_message_text(
+            prompt, DEFAULT_MODEL, 300, DEFAULT_TEMPERATURE, client
+        ).strip()
+    except Exception:
+        return None
 
 
 def _generate_directory_summary(
     dir_name: str, docs: List[Tuple[str, str]], client: anthropic.Anthropic
-) -> str:
-    """Generate a summary for a directory based on its files' documentation."""
+) -> Optional[str]:
+    """Summarize a directory from its files' documentation, or None on failure."""
 
     file_summaries = []
     for file_path, doc_content in docs:
@@ -567,15 +1040,11 @@ def _generate_directory_summary(
     """
 
     try:
-        response = client.messages.create(
-            model=DEFAULT_MODEL,
-            max_tokens=300,
-            temperature=DEFAULT_TEMPERATURE,
-            messages=[{"role": "user", "content": prompt}],
-        )
-        return response.content[0].text.strip()
-    except Exception as e:
-        return f"Directory summary generation failed for {dir_name}"
+        return _cached_message_text(
+            prompt, DEFAULT_MODEL, 300, DEFAULT_TEMPERATURE, client
+        ).strip()
+    except Exception:
+        return None
 
 
 def _organize_docs_by_directory(
@@ -588,11 +1057,7 @@ def _organize_docs_by_directory(
     for file_path, doc_content in docs.items():
         # Get directory from original file info
         dir_path = files.get(file_path, {}).get("directory", "")
-
-        if dir_path not in dir_structure:
-            dir_structure[dir_path] = []
-
-        dir_structure[dir_path].append((file_path, doc_content))
+        dir_structure.setdefault(dir_path, []).append((file_path, doc_content))
 
     return dir_structure
 
@@ -603,15 +1068,15 @@ def _truncate_content(content: str, max_chars: int) -> str:
     if len(content) <= max_chars:
         return content
 
-    # Try to truncate at a sentence boundary
-    truncated = content[:max_chars]
-    last_period = truncated.rfind(".")
-    last_newline = truncated.rfind("\n")
-
-    # Use the later of the two boundaries
-    boundary = max(last_period, last_newline)
+    # Try to truncate at a sentence boundary, only looking past 70% of
+    # max_chars so the result is not too short; searching the original
+    # string in that window avoids copying and rescanning the prefix
+    lo = int(max_chars * 0.7) + 1
+    boundary = max(
+        content.rfind(".", lo, max_chars), content.rfind("\n", lo, max_chars)
+    )
 
-    if boundary > max_chars * 0.7:  # Only use boundary if it's not too short
-        return truncated[: boundary + 1] + "\n\n[Content truncated...]"
+    if boundary >= 0:
+        return content[: boundary + 1] + "\n\n[Content truncated...]"
     else:
-        return truncated + "\n\n[Content truncated...]"
+        return content[:max_chars] + "\n\n[Content truncated...]"
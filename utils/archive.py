@@ -2,27 +2,59 @@
 Archive file extraction utilities.
 """
 
+import hashlib
+import io
 import os
+import tarfile
 import zipfile
 import tempfile
 import shutil
-from typing import Dict, List, Tuple, Any, Optional
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, FrozenSet, Iterable, Tuple, Any, Optional
 from config.constants import (
     SUPPORTED_EXTENSIONS,
-    SUPPORTED_ARCHIVE_FORMATS,
+    SUPPORTED_EXTENSIONS_SET,
+    SUPPORTED_ARCHIVE_FORMATS_SET,
+    SUPPORTED_EXT_RE,
+    TAR_STREAM_MODES,
+    TAR_STREAM_BUFSIZE,
     MAX_EXTRACT_SIZE,
     MAX_FILES,
     MAX_UPLOAD_SIZE,
+    get_archive_extension,
 )
 
+try:
+    import blake3
+except ImportError:  # optional; hashlib.blake2b is used instead
+    blake3 = None
 
-def extract_archive_to_temp_dir(uploaded_file, file_extension: str) -> Tuple[str, str]:
+
+def content_digest(data: bytes) -> str:
+    """
+    Hash file contents once at extraction so every consumer can reuse it.
+
+    Uses BLAKE3 when the optional blake3 package is installed, else BLAKE2b.
+
+    Args:
+        data: Raw file bytes
+
+    Returns:
+        Hex digest of the contents
+    """
+    if blake3 is not None:
+        return blake3.blake3(data).hexdigest()
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+
+def extract_archive_to_temp_dir(archive_data: bytes, file_extension: str) -> Tuple[str, str]:
     """
     Extract the contents of an archive file to a temporary directory.
     Supports multiple archive formats.
 
     Args:
-        uploaded_file: The uploaded archive file
+        archive_data: Raw bytes of the uploaded archive
         file_extension: The file extension to determine the archive type
 
     Returns:
@@ -34,14 +66,12 @@ def extract_archive_to_temp_dir(uploaded_file, file_extension: str) -> Tuple[str
 
     # Save uploaded file to disk temporarily
     with open(temp_archive_path, "wb") as f:
-        f.write(uploaded_file.getbuffer())
+        f.write(archive_data)
 
     extraction_dir = os.path.join(temp_dir, "extracted")
     os.makedirs(extraction_dir, exist_ok=True)
 
-    uploaded_file.seek(0, os.SEEK_END)
-    file_size = uploaded_file.tell()
-    uploaded_file.seek(0)
+    file_size = len(archive_data)
     
     if file_size > MAX_UPLOAD_SIZE:  
         raise Exception(f"Archive too large: {file_size / (1024*1024):.1f}MB")
@@ -117,44 +147,65 @@ def extract_archive_to_temp_dir(uploaded_file, file_extension: str) -> Tuple[str
 
 
 def extract_files_from_archive(
-    uploaded_file,
-    selected_extensions: Optional[List[str]] = None,
+    archive_data: bytes,
+    file_name: str,
+    selected_extensions: Optional[Iterable[str]] = None,
     max_file_size_mb: int = 5,
 ) -> Dict[str, Dict[str, Any]]:
     """
     Extract files from various archive formats based on selected extensions.
 
     Args:
-        uploaded_file: The uploaded archive file
-        selected_extensions: List of file extensions to extract (None for all supported)
+        archive_data: Raw bytes of the uploaded archive
+        file_name: Name of the uploaded archive, used to pick the format
+        selected_extensions: File extensions to extract (None for all supported)
         max_file_size_mb: Maximum size of individual files to process in MB
 
     Returns:
         Dictionary mapping file paths to their content
     """
     if selected_extensions is None:
-        selected_extensions = list(SUPPORTED_EXTENSIONS.keys())
+        selected_extensions = SUPPORTED_EXTENSIONS_SET
+    # Built once so every per-entry check is a single set lookup
+    selected_extensions = frozenset(selected_extensions)
 
     # Determine archive type from filename
-    file_name = uploaded_file.name
-    file_extension = os.path.splitext(file_name)[1].lower()
+    file_extension = get_archive_extension(file_name)
 
-    if file_extension not in SUPPORTED_ARCHIVE_FORMATS:
+    if file_extension not in SUPPORTED_ARCHIVE_FORMATS_SET:
         raise ValueError(f"Unsupported archive format: {file_extension}.")
 
+    max_bytes = max_file_size_mb * 1024 * 1024
+
+    # ZIP entries can be read straight from the upload without a temp copy
+    if file_extension == ".zip":
+        return _extract_zip_files(archive_data, selected_extensions, max_bytes)
+
+    # TAR archives are streamed member by member, also without a temp copy
+    if file_extension in TAR_STREAM_MODES:
+        return _extract_tar_files(
+            archive_data,
+            TAR_STREAM_MODES[file_extension],
+            selected_extensions,
+            max_bytes,
+        )
+
     # Extract archive to temp directory
     temp_dir, extraction_dir = extract_archive_to_temp_dir(
-        uploaded_file, file_extension
+        archive_data, file_extension
     )
 
     try:
         # Process extracted files
         extracted_files = {}
-        max_bytes = max_file_size_mb * 1024 * 1024
 
         # Walk through directory structure
         for root, _, files in os.walk(extraction_dir):
             for file in files:
+                # Cheap suffix check before any stat or open
+                if not SUPPORTED_EXT_RE.search(file):
+                    continue
+
                 file_path = os.path.join(root, file)
                 rel_path = os.path.relpath(file_path, extraction_dir)
 
@@ -165,19 +216,11 @@ def extract_files_from_archive(
                 file_ext = os.path.splitext(file)[1].lower()
                 if file_ext in selected_extensions:
                     try:
-                        with open(file_path, "r", encoding="utf-8") as f:
-                            content = f.read()
-
-                            # Get directory structure for organization
-                            dir_path = os.path.dirname(rel_path)
-
-                            extracted_files[rel_path] = {
-                                "content": content,
-                                "language": SUPPORTED_EXTENSIONS.get(
-                                    file_ext, "Unknown"
-                                ),
-                                "directory": dir_path,
-                            }
+                        with open(file_path, "rb") as f:
+                            data = _normalize_newlines(f.read())
+                        extracted_files[rel_path] = _build_file_info(
+                            rel_path, data.decode("utf-8"), file_ext, data
+                        )
                     except UnicodeDecodeError:
                         # Skip binary files or files with encoding issues
                         continue
@@ -187,3 +230,213 @@ def extract_files_from_archive(
     finally:
         # Clean up temporary directory
         shutil.rmtree(temp_dir)
+
+
+def _extract_zip_files(
+    archive_data: bytes, selected_extensions: FrozenSet[str], max_bytes: int
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Read matching entries directly from a ZIP archive.
+
+    Entries are decompressed only if they pass the extension and size checks.
+    Selected entries are inflated in parallel; zlib releases the GIL while
+    decompressing, so threads overlap on multi-entry archives.
+
+    Args:
+        archive_data: Raw bytes of the ZIP archive
+        selected_extensions: Set of file extensions to extract
+        max_bytes: Maximum uncompressed size of individual files in bytes
+
+    Returns:
+        Dictionary mapping file paths to their content
+    """
+    file_size = len(archive_data)
+
+    if file_size > MAX_UPLOAD_SIZE:
+        raise Exception(f"Archive too large: {file_size / (1024*1024):.1f}MB")
+
+    try:
+        with zipfile.ZipFile(io.BytesIO(archive_data), "r") as zip_ref:
+            infos = zip_ref.infolist()
+
+            # Same zip bomb protections as the temp directory path
+            if len(infos) > MAX_FILES:
+                raise Exception("Archive contains too many files")
+
+            total_size = 0
+            for info in infos:
+                if ".." in info.filename or info.filename.startswith("/"):
+                    raise Exception(f"Unsafe path: {info.filename}")
+
+                total_size += info.file_size
+                if total_size > MAX_EXTRACT_SIZE:
+                    raise Exception("Archive too large when extracted")
+
+            selected = [
+                info
+                for info in infos
+                if SUPPORTED_EXT_RE.search(info.filename)
+                and not info.is_dir()
+                and info.file_size <= max_bytes
+                and os.path.splitext(info.filename)[1].lower() in selected_extensions
+            ]
+
+        extracted_files = {}
+        if not selected:
+            return extracted_files
+
+        # ZipFile handles are not safe to share across threads, so each
+        # worker opens its own over the same in-memory archive bytes
+        local = threading.local()
+        handles = []
+
+        def read_entry(info: zipfile.ZipInfo) -> Optional[Tuple[str, str, int]]:
+            zip_ref = getattr(local, "zip_ref", None)
+            if zip_ref is None:
+                zip_ref = local.zip_ref = zipfile.ZipFile(io.BytesIO(archive_data))
+                handles.append(zip_ref)
+            with zip_ref.open(info) as f:
+                data = _normalize_newlines(f.read(info.file_size))
+            try:
+                return data.decode("utf-8"), content_digest(data), len(data)
+            except UnicodeDecodeError:
+                # Skip binary files or files with encoding issues
+                return None
+
+        max_workers = min(os.cpu_count() or 1, len(selected))
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                # map keeps archive order so the result is deterministic
+                contents = list(executor.map(read_entry, selected))
+        finally:
+            for zip_ref in handles:
+                zip_ref.close()
+
+        for info, entry in zip(selected, contents):
+            if entry is None:
+                continue
+            content, digest, size_bytes = entry
+            rel_path = os.path.normpath(info.filename)
+            extracted_files[rel_path] = _build_file_info(
+                rel_path,
+                content,
+                os.path.splitext(info.filename)[1].lower(),
+                digest=digest,
+                size_bytes=size_bytes,
+            )
+
+    except Exception as e:
+        raise Exception(f"Failed to extract archive: {str(e)}")
+
+    return extracted_files
+
+
+def _extract_tar_files(
+    archive_data: bytes, mode: str, selected_extensions: FrozenSet[str], max_bytes: int
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Stream matching members out of a TAR archive.
+
+    The archive is opened in stream mode, so members are decompressed in a
+    single forward pass and only one member is held in memory at a time.
+    Zip bomb checks run as members are encountered rather than up front.
+
+    Args:
+        archive_data: Raw bytes of the TAR archive
+        mode: tarfile stream mode, e.g. "r|gz"
+        selected_extensions: Set of file extensions to extract
+        max_bytes: Maximum uncompressed size of individual files in bytes
+
+    Returns:
+        Dictionary mapping file paths to their content
+    """
+    file_size = len(archive_data)
+
+    if file_size > MAX_UPLOAD_SIZE:
+        raise Exception(f"Archive too large: {file_size / (1024*1024):.1f}MB")
+
+    extracted_files = {}
+    try:
+        with tarfile.open(
+            fileobj=io.BytesIO(archive_data), mode=mode, bufsize=TAR_STREAM_BUFSIZE
+        ) as tar_ref:
+            file_count = 0
+            total_size = 0
+            for member in tar_ref:
+                file_count += 1
+                if file_count > MAX_FILES:
+                    raise Exception("Archive contains too many files")
+
+                if ".." in member.name or member.name.startswith("/"):
+                    raise Exception(f"Unsafe path: {member.name}")
+
+                total_size += member.size
+                if total_size > MAX_EXTRACT_SIZE:
+                    raise Exception("Archive too large when extracted")
+
+                # Links and devices are skipped along with unwanted files
+                if (
+                    not member.isfile()
+                    or not SUPPORTED_EXT_RE.search(member.name)
+                    or member.size > max_bytes
+                ):
+                    continue
+
+                file_ext = os.path.splitext(member.name)[1].lower()
+                if file_ext not in selected_extensions:
+                    continue
+
+                data = _normalize_newlines(
+                    tar_ref.extractfile(member).read(member.size)
+                )
+                try:
+                    content = data.decode("utf-8")
+                except UnicodeDecodeError:
+                    # Skip binary files or files with encoding issues
+                    continue
+
+                rel_path = os.path.normpath(member.name)
+                extracted_files[rel_path] = _build_file_info(
+                    rel_path, content, file_ext, data
+                )
+
+    except Exception as e:
+        raise Exception(f"Failed to extract archive: {str(e)}")
+
+    return extracted_files
+
+
+def _normalize_newlines(data: bytes) -> bytes:
+    """
+    Translate CRLF and lone CR line endings to LF, as reading in text mode does.
+
+    Working on the UTF-8 bytes keeps the digest and size in step with the
+    decoded content; CR and LF bytes never occur inside a multibyte sequence.
+    """
+    if b"\r" not in data:
+        return data
+    return data.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+
+
+def _build_file_info(
+    rel_path: str,
+    content: str,
+    file_ext: str,
+    data: Optional[bytes] = None,
+    digest: Optional[str] = None,
+    size_bytes: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Build the file info entry stored for each extracted file.
+
+    Pass either the raw bytes or an already computed digest and size of them.
+    """
+    return {
+        "content": content,
+        "digest": digest or content_digest(data),
+        # UTF-8 byte size, so size checks never need to re-encode the content
+        "size_bytes": size_bytes if size_bytes is not None else len(data),
+        "language": SUPPORTED_EXTENSIONS.get(file_ext, "Unknown"),
+        # Get directory structure for organization
+        "directory": os.path.dirname(rel_path),
+    }
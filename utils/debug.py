@@ -1,5 +1,21 @@
+import functools
+import os
+
 import streamlit as st
 
+
+@functools.lru_cache(maxsize=None)
+def is_debug_enabled() -> bool:
+    """Read the DEBUG environment flag once instead of on every rerun."""
+    return os.getenv("DEBUG", "").strip().lower() in ("1", "true", "yes")
+
+
+@st.fragment
+def debug_panel():
+    """Render the debug info as a fragment so it reruns on its own."""
+    show_debug_info()
+
+
 def show_debug_info():
     """Show debug information in sidebar."""
     with st.expander("🐛 Debug Info", expanded=False):
@@ -2,10 +2,33 @@
 Documentation generation and processing utilities.
 """
 
+import re
 from typing import Dict, Any
 from collections import defaultdict
 
 
+def retitle_documentation(documentation: str, file_path: str, new_path: str) -> str:
+    """
+    Point documentation generated for one file at another path.
+
+    Only the 'Documentation for <path>' title the prompt asks for is
+    rewritten; the rest of the text is returned unchanged.
+
+    Args:
+        documentation: Documentation generated for file_path
+        file_path: Path the documentation was generated for
+        new_path: Path the documentation should describe
+
+    Returns:
+        Documentation titled for new_path
+    """
+    if new_path == file_path:
+        return documentation
+    # The lookahead stops "a.py" from matching the start of "a.pyc"
+    title = re.compile(f"Documentation for {re.escape(file_path)}(?![\\w./-])")
+    return title.sub(lambda _: f"Documentation for {new_path}", documentation, count=1)
+
+
 def build_combined_documentation(documentation: Dict[str, Any]) -> str:
     """
     Build a single combined documentation file from individual file documentation.
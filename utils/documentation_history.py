@@ -39,9 +39,9 @@ class DocumentationHistory:
 
         # Generate unique ID based on content and timestamp
         timestamp = datetime.datetime.now()
-        content_hash = hashlib.md5(
-            json.dumps(documentation, sort_keys=True).encode()
-        ).hexdigest()[:8]
+        # Serialize once; the same bytes feed the ID hash and the size estimate
+        serialized = json.dumps(documentation, sort_keys=True).encode()
+        content_hash = hashlib.blake2b(serialized, digest_size=4).hexdigest()
         doc_id = f"{timestamp.strftime('%Y%m%d_%H%M%S')}_{content_hash}"
 
         # Count files and get file types
@@ -65,7 +65,7 @@ class DocumentationHistory:
             "file_types": list(file_types),
             "has_overview": "__project_overview__" in documentation,
             "has_structure": "__directory_structure__" in documentation,
-            "size_estimate": len(json.dumps(documentation)) // 1024,  # KB estimate
+            "size_estimate": len(serialized) // 1024,  # KB estimate
         }
 
         # Add to beginning of history (most recent first)
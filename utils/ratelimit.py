@@ -0,0 +1,154 @@
+"""
+Client-side rate limiting for Claude API calls.
+"""
+
+import asyncio
+import datetime
+import threading
+import time
+import weakref
+from typing import Any, Dict, Mapping, Optional
+
+from config.constants import DEFAULT_REQUESTS_PER_MINUTE, RATE_LIMIT_BURST
+
+
+class TokenBucket:
+    """Thread-safe token bucket that paces requests to a per-minute budget."""
+
+    def __init__(self, requests_per_minute: float, burst: int = RATE_LIMIT_BURST):
+        """
+        Args:
+            requests_per_minute: Sustained request rate to allow
+            burst: Maximum number of requests that may start back to back
+        """
+        self._lock = threading.Lock()
+        self._capacity = float(burst)
+        self._tokens = float(burst)
+        self._rate = requests_per_minute / 60.0
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+
+    def set_rate(self, requests_per_minute: float):
+        """Change the sustained request rate."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._rate = requests_per_minute / 60.0
+
+    def acquire(self):
+        """Block until a request may be sent."""
+        while True:
+            wait = self._try_take()
+            if not wait:
+                return
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request may be sent."""
+        while True:
+            wait = self._try_take()
+            if not wait:
+                return
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float):
+        """Hold off all callers for the given number of seconds."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+            self._tokens = 0.0
+
+    def observe(self, headers: Mapping[str, str]):
+        """
+        Adjust the bucket from Anthropic rate limit response headers.
+
+        Follows the per-minute request limit the server reports, and pauses
+        on a ``retry-after`` header or when the server reports no requests
+        remaining until the window resets.
+        """
+        limit = _parse_float(headers.get("anthropic-ratelimit-requests-limit"))
+        if limit:
+            self.set_rate(limit)
+
+        retry_after = _parse_float(headers.get("retry-after"))
+        if retry_after:
+            self.pause(retry_after)
+            return
+
+        if headers.get("anthropic-ratelimit-requests-remaining") == "0":
+            reset = _seconds_until(headers.get("anthropic-ratelimit-requests-reset"))
+            if reset:
+                self.pause(reset)
+
+    def _try_take(self) -> float:
+        """Take a token if one is available, else return seconds to wait."""
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            if now >= self._paused_until and self._tokens >= 1:
+                self._tokens -= 1
+                return 0.0
+            return max(self._paused_until - now, (1 - self._tokens) / self._rate)
+
+    def _refill(self, now: float):
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+
+def _parse_float(value: Optional[str]) -> Optional[float]:
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+def _seconds_until(timestamp: Optional[str]) -> Optional[float]:
+    """Seconds from now until an RFC 3339 timestamp, or None if unparseable."""
+    if not timestamp:
+        return None
+    try:
+        reset = datetime.datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+    except ValueError:
+        return None
+    now = datetime.datetime.now(datetime.timezone.utc)
+    return max(0.0, (reset - now).total_seconds())
+
+
+# One bucket per API key, shared by every session and thread using that key.
+# Its rate only follows the server's headers, never a session's setting.
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+# Optional extra cap per client copy, e.g. one session's requests-per-minute
+_client_caps: "weakref.WeakKeyDictionary[Any, TokenBucket]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def rate_limiter_for(api_key: str) -> TokenBucket:
+    """
+    Return the token bucket for an API key, creating it on first use.
+
+    Anthropic enforces rate limits per key, so sessions using different keys
+    neither share a budget nor wait out each other's retry-after pauses.
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(api_key)
+        if limiter is None:
+            limiter = _limiters[api_key] = TokenBucket(DEFAULT_REQUESTS_PER_MINUTE)
+        return limiter
+
+
+def cap_client_rate(client: Any, requests_per_minute: float):
+    """
+    Cap the requests sent through one client below its key's shared rate.
+
+    The cap only ever slows that client down, so a session can lower its own
+    request rate but cannot raise or lower it for other users of the key.
+    """
+    _client_caps[client] = TokenBucket(requests_per_minute)
+
+
+def client_rate_cap(client: Any) -> Optional[TokenBucket]:
+    """Return the cap set with cap_client_rate, or None if there is none."""
+    return _client_caps.get(client)
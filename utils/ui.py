@@ -7,11 +7,11 @@ import time
 import json
 import streamlit as st
 from typing import Dict, Any, Tuple, Optional
-from dotenv import load_dotenv
 from config.constants import (
-    SUPPORTED_EXTENSIONS,
     FILE_TYPE_CATEGORIES,
+    LANGUAGE_CATEGORIES,
     SUPPORTED_ARCHIVE_FORMATS,
+    get_archive_extension,
     DOC_LEVELS,
     DEFAULT_DOC_LEVEL,
     MAX_FILE_SIZE_RANGE,
@@ -22,6 +22,12 @@ from config.constants import (
     MAX_BATCH_SIZE_DEMO_MODE,
     MIN_FULL_CONCURRENCY_THREADS,
     MAX_FULL_CONCURRENCY_THREADS,
+    DEFAULT_FULL_CONCURRENCY_THREADS,
+    MIN_ASYNC_CONCURRENCY,
+    MAX_ASYNC_CONCURRENCY,
+    DEFAULT_ASYNC_CONCURRENCY,
+    DEFAULT_REQUESTS_PER_MINUTE,
+    REQUESTS_PER_MINUTE_RANGE,
     APP_CSS,
     MERMAID_SCRIPT,
 )
@@ -30,8 +36,15 @@ from utils.html import convert_markdown_to_html
 from utils.api import get_api_key
 
 
-# Load environment variables
-load_dotenv()
+@st.cache_resource(show_spinner=False)
+def _get_page_head_html() -> str:
+    """Build the custom styling and Mermaid script block once per process."""
+    return f"""
+    <style>
+    {APP_CSS}
+    </style>
+    {MERMAID_SCRIPT}
+    """
 
 
 def setup_page():
@@ -40,16 +53,9 @@ def setup_page():
         page_title="Documentation Generator", page_icon="📚", layout="wide"
     )
 
-    # Apply custom styling
-    st.markdown(
-        f"""
-    <style>
-    {APP_CSS}
-    </style>
-    {MERMAID_SCRIPT}
-    """,
-        unsafe_allow_html=True,
-    )
+    # Apply custom styling. This must be emitted on every run: Streamlit
+    # removes elements that a rerun does not render again.
+    st.markdown(_get_page_head_html(), unsafe_allow_html=True)
 
 
 def sidebar_config() -> Dict[str, Any]:
@@ -200,14 +206,20 @@ def sidebar_config() -> Dict[str, Any]:
 
     # Performance settings
     st.sidebar.subheader("Performance Settings")
-    method_list = ["Sequential", "Batch Processing", "Full Concurrent"]
+    method_list = [
+        "Sequential",
+        "Batch Processing",
+        "Full Concurrent",
+        "Async Concurrent",
+        "Message Batch API",
+    ]
     if st.session_state.anthropic_api_key == demo_pw:
         method_list = method_list[:2]
     concurrency_method = st.sidebar.radio(
         "Processing Method:",
         method_list,
         index=1,  # Default to Batch Processing
-        help="Choose how to process multiple files. Batch Processing is recommended for all use cases. Full Concurrent is marginally faster for larger projects but may cause issues currently. Full Concurrent is unavailable while in demo mode.",
+        help="Choose how to process multiple files. Batch Processing is recommended for all use cases. Full Concurrent is marginally faster for larger projects but may cause issues currently. Async Concurrent keeps many requests in flight on a single thread. Message Batch API submits every file as one batch job at half the cost, but results only appear once the whole batch has finished. Only Sequential and Batch Processing are available in demo mode.",
     )
 
     # Initialize the config dictionary
@@ -234,15 +246,36 @@ def sidebar_config() -> Dict[str, Any]:
             min_value=MIN_BATCH_SIZE,
             max_value=max_batch_size,
             value=3,
-            help="Number of files to process simultaneously in each batch. Max batch size is limited in demo mode.",
+            help="Number of requests to run simultaneously in each batch. Small files are grouped, several to a request. Max batch size is limited in demo mode.",
         )
     elif concurrency_method == "Full Concurrent":
         config["max_workers"] = st.sidebar.slider(
             "Max Workers",
             min_value=MIN_FULL_CONCURRENCY_THREADS,
             max_value=MAX_FULL_CONCURRENCY_THREADS,
-            value=3,
-            help="Maximum number of concurrent threads (keep low to avoid API issues)",
+            value=DEFAULT_FULL_CONCURRENCY_THREADS,
+            help="Maximum number of Claude requests in flight at once. The requests-per-minute limit below still applies.",
+        )
+    elif concurrency_method == "Async Concurrent":
+        config["max_concurrent"] = st.sidebar.slider(
+            "Max Concurrent Requests",
+            min_value=MIN_ASYNC_CONCURRENCY,
+            max_value=MAX_ASYNC_CONCURRENCY,
+            value=DEFAULT_ASYNC_CONCURRENCY,
+            help="Maximum number of Claude requests in flight at once. The requests-per-minute limit below still applies.",
+        )
+
+    # The demo key is shared by every visitor, so its rate is not adjustable
+    if st.session_state.anthropic_api_key == demo_pw:
+        config["requests_per_minute"] = DEFAULT_REQUESTS_PER_MINUTE
+    else:
+        config["requests_per_minute"] = st.sidebar.slider(
+            "Requests per Minute",
+            min_value=REQUESTS_PER_MINUTE_RANGE[0],
+            max_value=REQUESTS_PER_MINUTE_RANGE[1],
+            value=DEFAULT_REQUESTS_PER_MINUTE,
+            step=10,
+            help="Client-side cap on Claude API requests for this session. Requests never go faster than the rate limit Anthropic reports for your key, however high this is set.",
         )
 
     return config
@@ -264,7 +297,8 @@ def display_file_summary_enhanced(files: Dict[str, Dict[str, Any]]) -> bool:
     col1, col2 = st.columns(2)
 
     with col1:
-        st.success(f"Found {len(files)} code files")
+        total_size = sum(info.get("size_bytes", 0) for info in files.values())
+        st.success(f"Found {len(files)} code files ({total_size / 1024:.1f} KB)")
 
         # Count files by language and categorize
         language_counts = {}
@@ -275,17 +309,9 @@ def display_file_summary_enhanced(files: Dict[str, Dict[str, Any]]) -> bool:
             language_counts[lang] = language_counts.get(lang, 0) + 1
 
             # Find which category this language belongs to
-            file_ext = None
-            for ext, language in SUPPORTED_EXTENSIONS.items():
-                if language == lang:
-                    file_ext = ext
-                    break
-
-            if file_ext:
-                for category, file_types in FILE_TYPE_CATEGORIES.items():
-                    if any(ext == file_ext for ext, _ in file_types):
-                        category_counts[category] = category_counts.get(category, 0) + 1
-                        break
+            category = LANGUAGE_CATEGORIES.get(lang)
+            if category:
+                category_counts[category] = category_counts.get(category, 0) + 1
 
         # Display by category
         st.write("**Files by Category:**")
@@ -359,7 +385,7 @@ def file_uploader_section() -> Tuple[Optional[Any], Optional[str], Optional[str]
 
     if uploaded_file is not None:
         # Get archive format for display
-        file_extension = os.path.splitext(uploaded_file.name)[1].lower()
+        file_extension = get_archive_extension(uploaded_file.name)
 
         archive_format = SUPPORTED_ARCHIVE_FORMATS.get(file_extension, "Unknown")
 
@@ -379,7 +405,8 @@ def display_file_summary(files: Dict[str, Dict[str, Any]]) -> bool:
     """
     col1, col2 = st.columns(2)
     with col1:
-        st.success(f"Found {len(files)} code files")
+        total_size = sum(info.get("size_bytes", 0) for info in files.values())
+        st.success(f"Found {len(files)} code files ({total_size / 1024:.1f} KB)")
 
         # Count files by language
         language_counts = {}
@@ -471,8 +498,19 @@ def display_documentation(documentation: Dict[str, str]):
             "__directory_structure__",
             "__mermaid_diagram__",
         ]:
-            with st.expander(f"Documentation for {file_path}"):
-                st.markdown(doc)
+            _display_file_documentation(file_path, doc)
+
+
+@st.fragment
+def _display_file_documentation(file_path: str, doc: str):
+    """Render one file's documentation as a fragment that reruns on its own.
+
+    Args:
+        file_path: Path of the documented file
+        doc: Generated markdown for the file
+    """
+    with st.expander(f"Documentation for {file_path}"):
+        st.markdown(doc)
 
 
 def display_download_options(documentation: Dict[str, str], key_suffix: str = "", archive_filename: str = None):
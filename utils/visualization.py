@@ -2,6 +2,7 @@
 Directory structure visualization utilities.
 """
 
+import functools
 import os
 from collections import defaultdict
 from typing import Dict, List, Tuple, Any
@@ -10,23 +11,43 @@ from typing import Dict, List, Tuple, Any
 def build_directory_tree(files: Dict[str, Dict[str, Any]]) -> Tuple[Dict, str, str]:
     """
     Build a nested directory tree structure from the list of files.
+    Results are memoized on the paths, directories and languages involved.
 
     Args:
         files: Dictionary mapping file paths to file info
 
+    Returns:
+        Tuple of (tree structure, ASCII tree visualization, Mermaid diagram code)
+    """
+    entries = tuple(
+        (file_path, file_info.get("directory", ""), file_info["language"])
+        for file_path, file_info in files.items()
+    )
+    return _build_directory_tree(entries)
+
+
+@functools.lru_cache(maxsize=8)
+def _build_directory_tree(
+    entries: Tuple[Tuple[str, str, str], ...]
+) -> Tuple[Dict, str, str]:
+    """
+    Build the directory tree from hashable (path, directory, language) entries.
+
+    Args:
+        entries: Tuple of (file_path, directory, language) per file
+
     Returns:
         Tuple of (tree structure, ASCII tree visualization, Mermaid diagram code)
     """
     # Create nested directory structure
     tree = defaultdict(list)
-    for file_path, file_info in files.items():
-        dir_path = file_info.get("directory", "")
+    for file_path, dir_path, language in entries:
         file_name = os.path.basename(file_path)
 
         if dir_path:
-            tree[dir_path].append((file_name, file_info["language"]))
+            tree[dir_path].append((file_name, language))
         else:
-            tree["root"].append((file_name, file_info["language"]))
+            tree["root"].append((file_name, language))
 
     # Build hierarchical structure for ASCII tree
     def build_tree_structure():
@@ -49,11 +70,9 @@ def build_directory_tree(files: Dict[str, Dict[str, Any]]) -> Tuple[Dict, str, s
 
         # Populate directory relationships
         for dir_path in all_dirs:
-            if "/" in dir_path:
-                parent = "/".join(dir_path.split("/")[:-1])
-                structure[parent]["dirs"].add(dir_path.split("/")[-1])
-            else:
-                structure[""]["dirs"].add(dir_path)
+            # rpartition splits once; a top-level dir gets the "" parent
+            parent, _, dir_name = dir_path.rpartition("/")
+            structure[parent]["dirs"].add(dir_name)
 
         # Add files to their directories
         for dir_path, file_list in tree.items():
@@ -64,9 +83,8 @@ def build_directory_tree(files: Dict[str, Dict[str, Any]]) -> Tuple[Dict, str, s
 
         return structure
 
-    def generate_ascii_tree(structure, path="", prefix="", is_last=True):
-        """Recursively generate ASCII tree"""
-        lines = []
+    def generate_ascii_tree(structure, lines, path="", prefix="", is_last=True):
+        """Recursively append ASCII tree lines to one shared list"""
 
         # Get current directory info
         current = structure[path]
@@ -84,10 +102,9 @@ def build_directory_tree(files: Dict[str, Dict[str, Any]]) -> Tuple[Dict, str, s
             # Recursively process subdirectory
             child_path = f"{path}/{dir_name}" if path else dir_name
             child_prefix = prefix + ("    " if is_last_dir else "│   ")
-            child_lines = generate_ascii_tree(
-                structure, child_path, child_prefix, is_last_dir
+            generate_ascii_tree(
+                structure, lines, child_path, child_prefix, is_last_dir
             )
-            lines.extend(child_lines)
 
         # Process files
         for i, (file_name, language) in enumerate(files):
@@ -95,8 +112,6 @@ def build_directory_tree(files: Dict[str, Dict[str, Any]]) -> Tuple[Dict, str, s
             connector = "└── " if is_last_file else "├── "
             lines.append(f"{prefix}{connector}{file_name} ({language})")
 
-        return lines
-
     def generate_mermaid_diagram(structure):
         """Generate Mermaid diagram using the hierarchical structure"""
         mermaid_lines = ["graph TD"]
@@ -122,7 +137,7 @@ def build_directory_tree(files: Dict[str, Dict[str, Any]]) -> Tuple[Dict, str, s
                 mermaid_lines.append(f"    {current_id}[Project Root]")
             else:
                 current_id = get_node_id(current_path)
-                dir_name = current_path.split("/")[-1]
+                dir_name = current_path.rpartition("/")[2]
                 mermaid_lines.append(f"    {current_id}[{dir_name}/]")
 
             # Add subdirectories
@@ -150,8 +165,7 @@ def build_directory_tree(files: Dict[str, Dict[str, Any]]) -> Tuple[Dict, str, s
     # Generate ASCII tree
     structure = build_tree_structure()
     tree_lines = ["# Project Directory Structure", "```", "Project Root/"]
-    ascii_lines = generate_ascii_tree(structure)
-    tree_lines.extend(ascii_lines)
+    generate_ascii_tree(structure, tree_lines)
     tree_lines.append("```")
     
     mermaid_diagram = generate_mermaid_diagram(structure)